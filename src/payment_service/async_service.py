@@ -0,0 +1,220 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Self
+
+from src.payment_service.commons import (
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    to_model,
+)
+from src.payment_service.factories.payment_processor_factory import (
+    PaymentProcessorFactory,
+)
+from src.payment_service.idempotency import IdempotencyStore
+from src.payment_service.instrumentation import (
+    InstrumentationProtocol,
+    NoopInstrumentation,
+    PaymentMetrics,
+)
+from src.payment_service.loggers import TransactionLedger, TransactionLoggerProtocol
+from src.payment_service.notifiers import AsyncNotifierProtocol, as_async_notifier
+from src.payment_service.processors import (
+    AsyncPaymentProcessorProtocol,
+    AsyncRecurringPaymentProtocol,
+    AsyncRefundPaymentProtocol,
+    as_async_processor,
+)
+from src.payment_service.validators import (
+    CustomerValidator,
+    PaymentDataValidator,
+    RuleEngine,
+)
+
+
+@dataclass
+class AsyncPaymentService:
+    """
+    Asyncio version of `PaymentService`.
+
+    Processors and notifiers are awaited; sync implementations passed in are
+    wrapped automatically so either kind can be injected.
+    """
+
+    payment_processor: AsyncPaymentProcessorProtocol
+    notifier: AsyncNotifierProtocol
+    customer_validator: CustomerValidator
+    payment_validator: PaymentDataValidator
+    logger: TransactionLoggerProtocol
+    recurring_processor: Optional[AsyncRecurringPaymentProtocol] = None
+    refund_processor: Optional[AsyncRefundPaymentProtocol] = None
+    ledger: Optional[TransactionLedger] = None
+    idempotency_store: Optional[IdempotencyStore] = None
+    rule_engine: Optional[RuleEngine] = None
+    instrumentation: InstrumentationProtocol = field(
+        default_factory=NoopInstrumentation
+    )
+    metrics: Optional[PaymentMetrics] = None
+
+    def __post_init__(self):
+        self.payment_processor = as_async_processor(self.payment_processor)
+        self.notifier = as_async_notifier(self.notifier)
+        if self.recurring_processor:
+            self.recurring_processor = as_async_processor(self.recurring_processor)
+        if self.refund_processor:
+            self.refund_processor = as_async_processor(self.refund_processor)
+
+    @classmethod
+    def create_with_payment_processor(
+            cls, payment_data: PaymentData, **kwargs
+    ) -> Self:
+        try:
+            payment_processor = PaymentProcessorFactory.create_async_payment_processor(
+                payment_data
+            )
+            return cls(payment_processor=payment_processor, **kwargs)
+        except ValueError as e:
+            raise ValueError("Invalid payment data") from e
+
+    async def process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        with self.instrumentation.stage("total"):
+            return to_model(
+                await self._process_transaction(customer_data, payment_data)
+            )
+
+    async def _process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        with self.instrumentation.stage("validate_customer"):
+            self.customer_validator.validate(customer_data)
+        with self.instrumentation.stage("validate_payment"):
+            self.payment_validator.validate(payment_data)
+        if self.rule_engine:
+            with self.instrumentation.stage("rules"):
+                self.rule_engine.validate(customer_data, payment_data)
+        # Only a key from the caller marks a resubmission; equal contents alone
+        # may well be a second, legitimate charge.
+        deduplicate = self.idempotency_store and payment_data.idempotency_key
+        if deduplicate:
+            stored_response = await asyncio.to_thread(
+                self.idempotency_store.begin, payment_data.idempotency_key
+            )
+            if stored_response:
+                return stored_response
+        started = time.perf_counter()
+        try:
+            with self.instrumentation.stage("process"):
+                payment_response = await self.payment_processor.process_transaction(
+                    customer_data, payment_data
+                )
+        except Exception:
+            if deduplicate:
+                self.idempotency_store.release(payment_data.idempotency_key)
+            if self.metrics:
+                self.metrics.transaction_failed(self.payment_processor, payment_data)
+            raise
+        if self.metrics:
+            self.metrics.transaction_completed(
+                self.payment_processor,
+                payment_data,
+                payment_response,
+                time.perf_counter() - started,
+            )
+        if deduplicate:
+            self.idempotency_store.complete(
+                payment_data.idempotency_key, payment_response
+            )
+        # Log first: the charge happened even if the notification fails.
+        await self._log_transaction(customer_data, payment_data, payment_response)
+        with self.instrumentation.stage("notify"):
+            await self.notifier.send_confirmation(
+                customer_data, payment_data, payment_response
+            )
+        return payment_response
+
+    async def process_refund(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse:
+        if not self.refund_processor:
+            raise ValueError("this processor does not support refunds")
+
+        deduplicate = self.idempotency_store and idempotency_key
+        if deduplicate:
+            stored_response = await asyncio.to_thread(
+                self.idempotency_store.begin, idempotency_key
+            )
+            if stored_response:
+                return to_model(stored_response)
+        try:
+            with self.instrumentation.stage("refund"):
+                refund_response = await self._refund(transaction_id, idempotency_key)
+        except Exception:
+            if deduplicate:
+                self.idempotency_store.release(idempotency_key)
+            if self.metrics:
+                self.metrics.refund_failed(self.refund_processor)
+            raise
+        if self.metrics:
+            self.metrics.refund_completed(self.refund_processor, refund_response)
+        if deduplicate:
+            self.idempotency_store.complete(idempotency_key, refund_response)
+        with self.instrumentation.stage("log_refund"):
+            await asyncio.to_thread(self._log_refund, transaction_id, refund_response)
+        return to_model(refund_response)
+
+    async def setup_recurring(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        if not self.recurring_processor:
+            raise ValueError("this processor does not support recurring")
+        with self.instrumentation.stage("recurring"):
+            recurring_response = await self.recurring_processor.setup_recurring_payment(
+                customer_data, payment_data
+            )
+        await self._log_transaction(customer_data, payment_data, recurring_response)
+        return to_model(recurring_response)
+
+    async def _refund(
+            self, transaction_id: str, idempotency_key: Optional[str]
+    ) -> PaymentResponse:
+        if self.ledger:
+            await asyncio.to_thread(self.ledger.reserve_refund, transaction_id)
+        try:
+            return await self.refund_processor.refund_payment(
+                transaction_id, idempotency_key
+            )
+        except Exception:
+            if self.ledger:
+                await asyncio.to_thread(self.ledger.release_refund, transaction_id)
+            raise
+
+    async def _log_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ):
+        # The logger and ledger write files and SQLite synchronously; run them
+        # off the event loop so one write does not stall every coroutine.
+        with self.instrumentation.stage("log"):
+            await asyncio.to_thread(
+                self._write_transaction, customer_data, payment_data, payment_response
+            )
+
+    def _write_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ):
+        self.logger.log_transaction(customer_data, payment_data, payment_response)
+        if self.ledger:
+            self.ledger.log_transaction(customer_data, payment_data, payment_response)
+
+    def _log_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        self.logger.log_refund(transaction_id, refund_response)
+        if self.ledger:
+            self.ledger.log_refund(transaction_id, refund_response)
@@ -0,0 +1,98 @@
+"""
+Cold import time of the package entry points, from `python -X importtime`.
+
+    python -m src.payment_service.benchmarks.importtime --runs 5 \
+        --output importtime.json
+
+Every import runs in a fresh interpreter. The report gives the median
+cumulative import time of each entry point, whether Stripe's SDK got
+loaded, and the modules with the highest self time in the median run.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+ENTRY_POINTS = (
+    "src.payment_service.commons",
+    "src.payment_service.processors",
+    "src.payment_service.service",
+    "src.payment_service.async_service",
+    "src.payment_service.builders.builders",
+    "src.payment_service.main",
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _import_times(module: str) -> list[tuple[str, int, int]]:
+    """
+    Imports `module` in a new interpreter and returns `(name, self_us,
+    cumulative_us)` for every module it loaded.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def measure(module: str, runs: int, top: int) -> dict[str, Any]:
+    samples = []
+    for _ in range(runs):
+        times = _import_times(module)
+        total = next(cumulative for name, _, cumulative in times if name == module)
+        samples.append((total, times))
+    samples.sort(key=lambda sample: sample[0])
+    median_total, median_times = samples[len(samples) // 2]
+    heaviest = sorted(median_times, key=lambda entry: entry[1], reverse=True)[:top]
+    return {
+        "median_ms": median_total / 1e3,
+        "min_ms": samples[0][0] / 1e3,
+        "max_ms": samples[-1][0] / 1e3,
+        "modules": len(median_times),
+        "loads_stripe": any(name == "stripe" for name, _, _ in median_times),
+        "heaviest_self_ms": {name: self_us / 1e3 for name, self_us, _ in heaviest},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS))
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "entry_points": {
+            module: measure(module, args.runs, args.top) for module in args.modules
+        },
+    }
+    for module, result in results["entry_points"].items():
+        stripe = "loads stripe" if result["loads_stripe"] else ""
+        print(
+            f"{module:42}{result['median_ms']:9.1f} ms  "
+            f"{result['modules']:5} modules  {stripe}"
+        )
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
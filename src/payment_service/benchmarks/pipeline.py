@@ -0,0 +1,167 @@
+"""
+End-to-end benchmark of `PaymentService` with stub processor and notifier,
+and the real validators and `TransactionLogger`. Runs fully offline.
+
+    python -m src.payment_service.benchmarks.pipeline --transactions 20000 \
+        --output results.json
+
+Each workload (single, batch, concurrent) reports its throughput and the
+p50/p99 latency of every pipeline stage and of whole transactions (`total`),
+as recorded by the service's `HistogramInstrumentation`. The results are
+printed and, with `--output`, written as JSON for comparing runs.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.payment_service.benchmarks.stubs import StubNotifier, StubPaymentProcessor
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.instrumentation import (
+    HistogramInstrumentation,
+    HistogramSnapshot,
+)
+from src.payment_service.loggers import LogFormat, TransactionLogger
+from src.payment_service.service import PaymentService
+from src.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+def _service(
+        args: argparse.Namespace,
+        log_path: str,
+        instrumentation: HistogramInstrumentation,
+) -> PaymentService:
+    return PaymentService(
+        payment_processor=StubPaymentProcessor(args.processor_latency),
+        notifier=StubNotifier(args.notifier_latency),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(log_path, LogFormat(args.log_format)),
+        instrumentation=instrumentation,
+    )
+
+
+def _transactions(count: int) -> list[tuple[CustomerData, PaymentData]]:
+    return [
+        (
+            CustomerData(
+                name=f"Customer {row}",
+                contact_info=ContactInfo(email=f"customer{row}@example.com"),
+            ),
+            PaymentData(amount=100 + row % 10_000, source="tok_visa"),
+        )
+        for row in range(count)
+    ]
+
+
+def _single(service: PaymentService, transactions, args) -> int:
+    for customer_data, payment_data in transactions:
+        service.process_transaction(customer_data, payment_data)
+    return 0
+
+
+def _batch(service: PaymentService, transactions, args) -> int:
+    results = service.process_batch(transactions, max_in_flight=args.concurrency)
+    return sum(not result.ok for result in results)
+
+
+def _concurrent(service: PaymentService, transactions, args) -> int:
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(lambda item: service.process_transaction(*item), transactions))
+    return 0
+
+
+WORKLOADS: dict[str, Callable[..., int]] = {
+    "single": _single,
+    "batch": _batch,
+    "concurrent": _concurrent,
+}
+
+
+def _summary(snapshot: HistogramSnapshot) -> dict[str, float]:
+    return {
+        "count": snapshot.count,
+        "mean_us": snapshot.mean / 1e3,
+        "p50_us": snapshot.percentile(50) / 1e3,
+        "p99_us": snapshot.percentile(99) / 1e3,
+        "max_us": snapshot.max / 1e3,
+    }
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    transactions = _transactions(args.transactions)
+    results: dict[str, Any] = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "parameters": vars(args),
+        },
+        "workloads": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.workloads:
+            instrumentation = HistogramInstrumentation()
+            service = _service(
+                args, os.path.join(directory, f"{name}.log"), instrumentation
+            )
+            start = time.perf_counter()
+            errors = WORKLOADS[name](service, transactions, args)
+            elapsed = time.perf_counter() - start
+            results["workloads"][name] = {
+                "transactions": len(transactions),
+                "errors": errors,
+                "seconds": elapsed,
+                "throughput_per_s": len(transactions) / elapsed,
+                "stages": {
+                    stage: _summary(snapshot)
+                    for stage, snapshot in instrumentation.snapshot().items()
+                },
+            }
+    return results
+
+
+def _print(results: dict[str, Any]):
+    for name, workload in results["workloads"].items():
+        print(
+            f"{name}: {workload['throughput_per_s']:,.0f} tx/s "
+            f"({workload['transactions']} in {workload['seconds']:.2f}s, "
+            f"{workload['errors']} errors)"
+        )
+        for stage, summary in workload["stages"].items():
+            print(
+                f"  {stage:18}p50 {summary['p50_us']:9.1f} us"
+                f"   p99 {summary['p99_us']:9.1f} us"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument(
+        "--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS)
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--processor-latency", type=float, default=0.0)
+    parser.add_argument("--notifier-latency", type=float, default=0.0)
+    parser.add_argument(
+        "--log-format", choices=[f.value for f in LogFormat], default="text"
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args)
+    _print(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
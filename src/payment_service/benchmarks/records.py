@@ -0,0 +1,108 @@
+"""
+Per-object construction time and memory footprint of the Pydantic models
+against the compact slotted records in `commons.compact`.
+
+    python -m src.payment_service.benchmarks.records --count 1000000
+
+Memory is measured in a separate pass under tracemalloc, which would
+otherwise distort the timings.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable
+
+from src.payment_service.commons import (
+    CompactContactInfo,
+    CompactCustomerData,
+    CompactPaymentData,
+    CompactPaymentResponse,
+    ContactInfo,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+)
+
+
+def _response(cls) -> Callable[[int], object]:
+    return lambda row: cls(
+        status="succeeded",
+        amount=row,
+        transaction_id="ch_3MmlLrLkdIwHu7ix0snN0B15",
+        message="Payment successful",
+    )
+
+
+def _constructed_response(row: int) -> PaymentResponse:
+    return PaymentResponse.model_construct(
+        status="succeeded",
+        amount=row,
+        transaction_id="ch_3MmlLrLkdIwHu7ix0snN0B15",
+        message="Payment successful",
+    )
+
+
+def _transaction(customer_cls, contact_cls, payment_cls) -> Callable[[int], object]:
+    return lambda row: (
+        customer_cls(
+            name="Bench", contact_info=contact_cls(email="bench@example.com")
+        ),
+        payment_cls(amount=row, source="tok_visa"),
+    )
+
+
+CASES: dict[str, Callable[[int], object]] = {
+    "PaymentResponse (validated)": _response(PaymentResponse),
+    "PaymentResponse (model_construct)": _constructed_response,
+    "CompactPaymentResponse": _response(CompactPaymentResponse),
+    "customer+payment (validated)": _transaction(
+        CustomerData, ContactInfo, PaymentData
+    ),
+    "customer+payment (compact)": _transaction(
+        CompactCustomerData, CompactContactInfo, CompactPaymentData
+    ),
+}
+
+
+def _time(factory: Callable[[int], object], count: int) -> float:
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        objects = [factory(row) for row in range(count)]
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    del objects
+    return elapsed / count * 1e9
+
+
+def _memory(factory: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        objects = [factory(row) for row in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Exclude the list holding the objects.
+    overhead = objects.__sizeof__()
+    del objects
+    return (current - baseline - overhead) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'':36}{'ns/object':>12}{'bytes/object':>14}")
+    for name, factory in CASES.items():
+        nanoseconds = _time(factory, args.count)
+        size = _memory(factory, args.count)
+        print(f"{name:36}{nanoseconds:12.0f}{size:14.0f}")
+
+
+if __name__ == "__main__":
+    main()
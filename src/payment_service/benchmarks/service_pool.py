@@ -0,0 +1,66 @@
+"""
+Per-request cost of getting a `PaymentService`: building one with
+`PaymentServiceBuilder` against handing out a pooled instance.
+
+    python -m src.payment_service.benchmarks.service_pool --requests 20000
+
+"builder, new processors" clears the factory's cached processors before
+every build, which is what building per request cost before the factory
+reused processor instances.
+"""
+import argparse
+import time
+from typing import Callable
+
+from src.payment_service.builders.builders import PaymentServiceBuilder
+from src.payment_service.builders.pool import PaymentServicePool
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.factories.payment_processor_factory import (
+    PaymentProcessorFactory,
+)
+
+CUSTOMER = CustomerData(name="Bench", contact_info=ContactInfo(email="b@example.com"))
+PAYMENT = PaymentData(amount=100, source="tok_visa")
+
+
+def _build():
+    return (
+        PaymentServiceBuilder()
+        .set_logger()
+        .set_payment_validator()
+        .set_customer_validator()
+        .set_payment_processor(PAYMENT)
+        .set_notifier(CUSTOMER)
+        .build()
+    )
+
+
+def _build_with_new_processors():
+    PaymentProcessorFactory.clear_instances()
+    return _build()
+
+
+def _rate(get_service: Callable[[], object], requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        get_service()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    args = parser.parse_args()
+
+    pool = PaymentServicePool()
+    cases = {
+        "builder, new processors": _build_with_new_processors,
+        "builder, cached processors": _build,
+        "pool": lambda: pool.get(CUSTOMER, PAYMENT),
+    }
+    for name, get_service in cases.items():
+        print(f"{name:28}{_rate(get_service, args.requests):14,.0f} services/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import threading
+import time
+from typing import Optional, Sequence
+
+from src.payment_service.notifiers import SMSGatewayClientProtocol
+
+
+class FakeSMSGateway(SMSGatewayClientProtocol):
+    """
+    In-process SMS provider that simulates a round trip of `request_latency`
+    seconds per request plus `message_latency` seconds per message, and like
+    real providers serves at most `max_concurrency` requests at a time.
+    """
+
+    def __init__(
+            self,
+            request_latency: float = 0.02,
+            message_latency: float = 0.0,
+            max_concurrency: int = 4,
+    ):
+        self.request_latency = request_latency
+        self.message_latency = message_latency
+        self.requests = 0
+        self.messages = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(max_concurrency)
+
+    def send_bulk(
+            self, gateway: str, messages: Sequence[tuple[str, str]]
+    ) -> list[Optional[Exception]]:
+        with self._slots:
+            time.sleep(self.request_latency + self.message_latency * len(messages))
+        with self._lock:
+            self.requests += 1
+            self.messages += len(messages)
+        return [None] * len(messages)
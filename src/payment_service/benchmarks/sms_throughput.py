@@ -0,0 +1,72 @@
+"""
+Messages per second of the one-at-a-time `SMSNotifier` versus the
+`BatchingSMSNotifier`, both sending through a `FakeSMSGateway`.
+
+    python -m src.payment_service.benchmarks.sms_throughput --messages 2000
+"""
+import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.payment_service.benchmarks.sms_gateway import FakeSMSGateway
+from src.payment_service.commons import ContactInfo, CustomerData
+from src.payment_service.notifiers import (
+    BatchingSMSNotifier,
+    NotifierProtocol,
+    SMSNotifier,
+)
+
+CUSTOMER = CustomerData(name="Bench", contact_info=ContactInfo(phone="1234567890"))
+
+
+def _run(notifier: NotifierProtocol, messages: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(
+            executor.map(
+                lambda _: notifier.send_confirmation(CUSTOMER), range(messages)
+            )
+        )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--request-latency", type=float, default=0.02)
+    parser.add_argument("--gateway-concurrency", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--max-wait", type=float, default=0.01)
+    args = parser.parse_args()
+
+    single_gateway = FakeSMSGateway(
+        args.request_latency, max_concurrency=args.gateway_concurrency
+    )
+    batch_gateway = FakeSMSGateway(
+        args.request_latency, max_concurrency=args.gateway_concurrency
+    )
+    batching = BatchingSMSNotifier(
+        batch_gateway, max_batch=args.max_batch, max_wait=args.max_wait
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        single = _run(
+            SMSNotifier("FakeSMS", client=single_gateway), args.messages, args.threads
+        )
+        batched = _run(batching, args.messages, args.threads)
+    batching.close()
+
+    print(
+        f"one-at-a-time {args.messages / single:>8.0f} msg/s "
+        f"({single_gateway.requests} requests)"
+    )
+    print(
+        f"batched       {args.messages / batched:>8.0f} msg/s "
+        f"({batch_gateway.requests} requests)"
+    )
+
+
+if __name__ == "__main__":
+    main()
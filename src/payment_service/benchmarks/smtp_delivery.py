@@ -0,0 +1,64 @@
+"""
+Compares one SMTP session per confirmation e-mail against the pooled
+`SMTPEmailBackend`, both delivering to a local `SMTPStubServer`.
+
+    python -m src.payment_service.benchmarks.smtp_delivery --messages 2000
+"""
+import argparse
+import contextlib
+import io
+import smtplib
+import time
+
+from src.payment_service.benchmarks.smtp_stub import SMTPStubServer
+from src.payment_service.commons import ContactInfo, CustomerData
+from src.payment_service.notifiers import (
+    Confirmation,
+    EmailNotifier,
+    SMTPEmailBackend,
+)
+
+CUSTOMER = CustomerData(name="Bench", contact_info=ContactInfo(email="b@example.com"))
+
+
+def _per_message_sessions(server: SMTPStubServer, messages: int) -> float:
+    notifier = EmailNotifier()
+    start = time.perf_counter()
+    for _ in range(messages):
+        envelope = notifier._build_envelope(Confirmation(CUSTOMER))
+        with smtplib.SMTP(server.host, server.port) as connection:
+            connection.sendmail(envelope.sender, envelope.recipients, envelope.data)
+    return time.perf_counter() - start
+
+
+def _pooled(server: SMTPStubServer, messages: int, batch: int) -> float:
+    backend = SMTPEmailBackend(server.host, server.port)
+    notifier = EmailNotifier(backend=backend)
+    start = time.perf_counter()
+    for offset in range(0, messages, batch):
+        notifier.send_confirmations(
+            [Confirmation(CUSTOMER)] * min(batch, messages - offset)
+        )
+    elapsed = time.perf_counter() - start
+    backend.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    with SMTPStubServer() as server:
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = _per_message_sessions(server, args.messages)
+            pooled = _pooled(server, args.messages, args.batch)
+        delivered = server.messages
+    print(f"per-message {args.messages / single:>10.0f} msg/s ({single:.2f}s)")
+    print(f"pooled      {args.messages / pooled:>10.0f} msg/s ({pooled:.2f}s)")
+    print(f"delivered   {delivered}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import socketserver
+import threading
+from typing import Optional
+
+
+class _SMTPStubHandler(socketserver.StreamRequestHandler):
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        self._reply(b"220 stub ESMTP ready")
+        while line := self.rfile.readline():
+            command = line.strip().split(b" ", 1)[0].upper()
+            match command:
+                case b"EHLO":
+                    self._reply(b"250-stub\r\n250 PIPELINING")
+                case b"HELO" | b"MAIL" | b"RCPT" | b"RSET" | b"NOOP":
+                    self._reply(b"250 OK")
+                case b"DATA":
+                    self._reply(b"354 End data with <CR><LF>.<CR><LF>")
+                    while self.rfile.readline() not in (b".\r\n", b""):
+                        pass
+                    with self.server.lock:
+                        self.server.messages += 1
+                    self._reply(b"250 OK queued")
+                case b"QUIT":
+                    self._reply(b"221 Bye")
+                    return
+                case _:
+                    self._reply(b"502 Command not implemented")
+
+    def _reply(self, response: bytes):
+        self.wfile.write(response + b"\r\n")
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    """
+    Minimal local SMTP server that accepts and counts every message.
+
+    It stands in for a real mail server (in the spirit of aiosmtpd's
+    `Debugging` handler) in offline benchmarks.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0):
+        super().__init__(("127.0.0.1", port), _SMTPStubHandler)
+        self.messages = 0
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "SMTPStubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,67 @@
+"""
+Compares the pooled `StripePaymentProcessor` client against the legacy
+module-level Stripe calls, both talking to a local `StripeStubServer`.
+
+    python -m src.payment_service.benchmarks.stripe_client --requests 2000
+"""
+import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import stripe
+
+from src.payment_service.benchmarks.stripe_stub import StripeStubServer
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.processors import StripePaymentProcessor
+
+CUSTOMER = CustomerData(name="Bench", contact_info=ContactInfo(email="b@example.com"))
+PAYMENT = PaymentData(amount=100, source="tok_visa")
+
+
+def _legacy_charge(_):
+    stripe.api_key = "sk_test_stub"
+    stripe.Charge.create(
+        amount=PAYMENT.amount,
+        currency="usd",
+        source=PAYMENT.source,
+        description="Charge for " + CUSTOMER.name,
+    )
+
+
+def _run(call, requests: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(call, range(requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StripeStubServer(latency=args.latency) as server:
+        processor = StripePaymentProcessor(
+            api_key="sk_test_stub",
+            max_connections=args.threads,
+            api_base=server.api_base,
+        )
+        stripe.api_base = server.api_base
+        # The processors print on every call; keep the report readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = _run(_legacy_charge, args.requests, args.threads)
+            pooled = _run(
+                lambda _: processor.process_transaction(CUSTOMER, PAYMENT),
+                args.requests,
+                args.threads,
+            )
+    print(f"legacy {args.requests / legacy:>10.0f} req/s ({legacy:.2f}s)")
+    print(f"pooled {args.requests / pooled:>10.0f} req/s ({pooled:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
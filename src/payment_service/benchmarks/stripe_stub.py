@@ -0,0 +1,119 @@
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+_ids = itertools.count(1)
+
+
+def _next_id(prefix: str) -> str:
+    return f"{prefix}_stub{next(_ids)}"
+
+
+class _StripeStubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse connections like they would with Stripe.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond(self._route("GET", {}))
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        params = {key: values[0] for key, values in form.items()}
+        self._respond(self._route("POST", params))
+
+    def _route(self, method: str, params: dict) -> dict:
+        path = self.path.split("?")[0].rstrip("/").split("/")[2:]
+        match path:
+            case ["charges"]:
+                return {
+                    "id": _next_id("ch"),
+                    "object": "charge",
+                    "amount": int(params.get("amount", 0)),
+                    "status": "succeeded",
+                }
+            case ["refunds"]:
+                return {
+                    "id": _next_id("re"),
+                    "object": "refund",
+                    "amount": 0,
+                    "status": "succeeded",
+                }
+            case ["customers"]:
+                return {"id": _next_id("cus"), "object": "customer"}
+            case ["customers", customer_id]:
+                return {"id": customer_id, "object": "customer"}
+            case ["payment_methods", payment_method_id, *_]:
+                return {"id": payment_method_id, "object": "payment_method"}
+            case ["subscriptions"]:
+                return {
+                    "id": _next_id("sub"),
+                    "object": "subscription",
+                    "status": "active",
+                    "items": {
+                        "object": "list",
+                        "data": [{"price": {"unit_amount": 100}}],
+                    },
+                }
+            case _:
+                return {"error": {"type": "invalid_request_error", "message": method}}
+
+    def _respond(self, body: dict):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        payload = json.dumps(body).encode()
+        self.send_response(404 if "error" in body else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StripeStubServer(ThreadingHTTPServer):
+    """
+    Minimal local stand-in for the Stripe API, for offline benchmarks.
+
+    Answers charges, refunds, customers, payment methods and subscriptions
+    with canned objects after `latency` seconds. Use `api_base` as the
+    `StripePaymentProcessor(api_base=...)` argument.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        super().__init__(("127.0.0.1", port), _StripeStubHandler)
+        self.latency = latency
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StripeStubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
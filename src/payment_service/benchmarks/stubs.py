@@ -0,0 +1,90 @@
+"""
+In-process stand-ins for the processor and notifier, so the pipeline can be
+driven without any network access.
+"""
+import itertools
+import random
+import time
+from typing import Optional
+
+from src.payment_service.commons import (
+    CompactPaymentResponse,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+)
+from src.payment_service.notifiers import NotifierProtocol
+from src.payment_service.processors import (
+    PaymentProcessorProtocol,
+    RecurringPaymentProtocol,
+    RefundPaymentProtocol,
+)
+
+
+class StubPaymentProcessor(
+    PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol
+):
+    """
+    Answers after `latency` seconds, standing in for the processor's network
+    round trip, and declines a `failure_rate` fraction of the payments.
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._ids = itertools.count(1)
+
+    def process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> CompactPaymentResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            return CompactPaymentResponse(
+                status="failed",
+                amount=payment_data.amount,
+                message="Card declined",
+            )
+        return CompactPaymentResponse(
+            status="success",
+            amount=payment_data.amount,
+            transaction_id=f"stub_{next(self._ids)}",
+            message="Payment successful",
+        )
+
+    def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> CompactPaymentResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return CompactPaymentResponse(
+            status="success",
+            amount=0,
+            transaction_id=f"stub_re_{next(self._ids)}",
+            message="Refund successful",
+        )
+
+    def setup_recurring_payment(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> CompactPaymentResponse:
+        return self.process_transaction(customer_data, payment_data)
+
+
+class StubNotifier(NotifierProtocol):
+    """
+    Counts confirmations instead of sending them, after `latency` seconds.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent = 0
+
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
+        if self.latency:
+            time.sleep(self.latency)
+        self.sent += 1
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Self
 
 from src.payment_service.commons import PaymentData, CustomerData
@@ -6,7 +6,16 @@ from src.payment_service.factories.notifier_factory import NotifierFactory
 from src.payment_service.factories.payment_processor_factory import (
     PaymentProcessorFactory,
 )
-from src.payment_service.loggers import TransactionLogger
+from src.payment_service.instrumentation import (
+    InstrumentationProtocol,
+    NoopInstrumentation,
+    PaymentMetrics,
+)
+from src.payment_service.loggers import (
+    TransactionLedger,
+    TransactionLogger,
+    TransactionLoggerProtocol,
+)
 from src.payment_service.notifiers import NotifierProtocol
 from src.payment_service.processors import (
     PaymentProcessorProtocol,
@@ -23,12 +32,29 @@ class PaymentServiceBuilder:
     notifier: Optional[NotifierProtocol] = None
     customer_validator: Optional[CustomerValidator] = None
     payment_validator: Optional[PaymentDataValidator] = None
-    logger: Optional[TransactionLogger] = None
+    logger: Optional[TransactionLoggerProtocol] = None
     recurring_processor: Optional[RecurringPaymentProtocol] = None
     refund_processor: Optional[RefundPaymentProtocol] = None
+    ledger: Optional[TransactionLedger] = None
+    instrumentation: InstrumentationProtocol = field(
+        default_factory=NoopInstrumentation
+    )
+    metrics: Optional[PaymentMetrics] = None
+
+    def set_logger(self, logger: Optional[TransactionLoggerProtocol] = None) -> Self:
+        self.logger = logger or TransactionLogger()
+        return self
+
+    def set_ledger(self, ledger: Optional[TransactionLedger] = None) -> Self:
+        self.ledger = ledger or TransactionLedger()
+        return self
+
+    def set_instrumentation(self, instrumentation: InstrumentationProtocol) -> Self:
+        self.instrumentation = instrumentation
+        return self
 
-    def set_logger(self) -> Self:
-        self.logger = TransactionLogger()
+    def set_metrics(self, metrics: PaymentMetrics) -> Self:
+        self.metrics = metrics
         return self
 
     def set_payment_validator(self) -> Self:
@@ -80,4 +106,7 @@ class PaymentServiceBuilder:
             payment_processor=self.payment_processor,
             refund_processor=self.refund_processor,
             recurring_processor=self.recurring_processor,
+            ledger=self.ledger,
+            instrumentation=self.instrumentation,
+            metrics=self.metrics,
         )
@@ -0,0 +1,130 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Sequence
+
+from src.payment_service.commons import CustomerData, PaymentData
+from src.payment_service.commons.payment_data import PaymentType
+from src.payment_service.factories.notifier_factory import (
+    NotifierFactory,
+    NotifierKind,
+)
+from src.payment_service.factories.payment_processor_factory import (
+    PaymentProcessorFactory,
+)
+from src.payment_service.idempotency import IdempotencyStore
+from src.payment_service.instrumentation import (
+    InstrumentationProtocol,
+    NoopInstrumentation,
+    PaymentMetrics,
+)
+from src.payment_service.loggers import (
+    TransactionLedger,
+    TransactionLogger,
+    TransactionLoggerProtocol,
+)
+from src.payment_service.notifiers import NotifierProtocol
+from src.payment_service.service import PaymentService
+from src.payment_service.validators import (
+    CustomerValidator,
+    PaymentDataValidator,
+    RuleEngine,
+)
+
+ServiceKey = tuple[PaymentType, str, NotifierKind]
+
+DEFAULT_ROUTES: tuple[tuple[PaymentType, str], ...] = (
+    (PaymentType.ONLINE, "USD"),
+    (PaymentType.ONLINE, "EUR"),
+    (PaymentType.OFFLINE, "USD"),
+)
+
+
+@dataclass
+class PaymentServicePool:
+    """
+    Shared `PaymentService` instances, one per processor route and notifier
+    kind, built once instead of per request.
+
+    `prewarm` builds the services for `routes` up front and opens processor
+    connections; routes not listed are built on first use. Notifiers come
+    from `notifier_factory`, by default `NotifierFactory`, and processors
+    supporting refunds or recurring payments are used for those too.
+    Validators, logger, ledger, idempotency store, rule engine,
+    instrumentation and metrics are shared by all services of the pool, and
+    so must be safe to use from several threads.
+    """
+
+    routes: Sequence[tuple[PaymentType, str]] = DEFAULT_ROUTES
+    logger: TransactionLoggerProtocol = field(default_factory=TransactionLogger)
+    ledger: Optional[TransactionLedger] = None
+    idempotency_store: Optional[IdempotencyStore] = None
+    rule_engine: Optional[RuleEngine] = None
+    instrumentation: InstrumentationProtocol = field(
+        default_factory=NoopInstrumentation
+    )
+    metrics: Optional[PaymentMetrics] = None
+    notifier_factory: Optional[Callable[[NotifierKind], NotifierProtocol]] = None
+    prewarm_connections: int = 4
+
+    def __post_init__(self):
+        self.customer_validator = CustomerValidator()
+        self.payment_validator = PaymentDataValidator()
+        self._services: dict[ServiceKey, PaymentService] = {}
+        self._lock = threading.Lock()
+
+    def prewarm(self) -> "PaymentServicePool":
+        prewarmed = set()
+        for payment_type, currency in self.routes:
+            for kind in NotifierKind:
+                service = self._service((payment_type, currency, kind))
+            processor = service.payment_processor
+            if id(processor) not in prewarmed and hasattr(processor, "prewarm"):
+                processor.prewarm(self.prewarm_connections)
+                prewarmed.add(id(processor))
+        return self
+
+    def get(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentService:
+        key = (
+            payment_data.type,
+            payment_data.currency,
+            NotifierFactory.notifier_kind(customer_data),
+        )
+        service = self._services.get(key)
+        if service is None:
+            service = self._service(key)
+        return service
+
+    def _service(self, key: ServiceKey) -> PaymentService:
+        with self._lock:
+            service = self._services.get(key)
+            if service is None:
+                service = self._services[key] = self._build(*key)
+            return service
+
+    def _build(
+            self, payment_type: PaymentType, currency: str, kind: NotifierKind
+    ) -> PaymentService:
+        processor = PaymentProcessorFactory.resolve(payment_type, currency)
+        create_notifier = (
+            self.notifier_factory or NotifierFactory.create_notifier_of_kind
+        )
+        return PaymentService(
+            payment_processor=processor,
+            notifier=create_notifier(kind),
+            customer_validator=self.customer_validator,
+            payment_validator=self.payment_validator,
+            logger=self.logger,
+            ledger=self.ledger,
+            idempotency_store=self.idempotency_store,
+            rule_engine=self.rule_engine,
+            instrumentation=self.instrumentation,
+            metrics=self.metrics,
+            refund_processor=(
+                processor if hasattr(processor, "refund_payment") else None
+            ),
+            recurring_processor=(
+                processor if hasattr(processor, "setup_recurring_payment") else None
+            ),
+        )
@@ -2,10 +2,28 @@ from .contact import ContactInfo
 from .customer import CustomerData
 from .payment_data import PaymentData
 from .payment_response import PaymentResponse
+from .batch_result import BatchItemResult
+from .compact import (
+    CompactContactInfo,
+    CompactCustomerData,
+    CompactPaymentData,
+    CompactPaymentResponse,
+    to_compact,
+    to_model,
+)
+from .payment_batch import PaymentBatch
 
 __all__ = [
     "ContactInfo",
     "CustomerData",
     "PaymentData",
     "PaymentResponse",
+    "BatchItemResult",
+    "CompactContactInfo",
+    "CompactCustomerData",
+    "CompactPaymentData",
+    "CompactPaymentResponse",
+    "to_compact",
+    "to_model",
+    "PaymentBatch",
 ]
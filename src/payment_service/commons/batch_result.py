@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.payment_service.commons.customer import CustomerData
+from src.payment_service.commons.payment_data import PaymentData
+from src.payment_service.commons.payment_response import PaymentResponse
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of a single item processed through `PaymentService.process_batch`.
+
+    Either `response` is set (the transaction went through the pipeline) or
+    `error` holds the message of the exception that stopped it.
+    """
+
+    index: int
+    customer_data: CustomerData
+    payment_data: PaymentData
+    response: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,117 @@
+from dataclasses import dataclass, fields, replace
+from enum import Enum
+from typing import Any, ClassVar, Optional
+
+from pydantic import BaseModel
+
+from src.payment_service.commons.contact import ContactInfo
+from src.payment_service.commons.customer import CustomerData
+from src.payment_service.commons.payment_data import PaymentData, PaymentType
+from src.payment_service.commons.payment_response import PaymentResponse
+
+
+class _CompactModel:
+    """
+    Slotted, unvalidated stand-ins for the Pydantic models, for objects the
+    service produces itself. They expose the subset of the model API the
+    pipeline uses (`model_copy`, `model_dump`) and convert to and from the
+    Pydantic models with `from_model` / `to_model` at the API boundary.
+    """
+
+    __slots__ = ()
+    model: ClassVar[type[BaseModel]]
+
+    @classmethod
+    def from_model(cls, model: BaseModel):
+        return cls(**{
+            item.name: _compact(getattr(model, item.name)) for item in fields(cls)
+        })
+
+    def to_model(self) -> BaseModel:
+        return self.model.model_validate(self.model_dump())
+
+    def model_copy(self, update: Optional[dict[str, Any]] = None):
+        return replace(self, **(update or {}))
+
+    def model_dump(self, mode: str = "python") -> dict[str, Any]:
+        return {
+            item.name: _dump(getattr(self, item.name), mode) for item in fields(self)
+        }
+
+
+@dataclass(slots=True)
+class CompactContactInfo(_CompactModel):
+    model: ClassVar[type[BaseModel]] = ContactInfo
+
+    email: Optional[str] = None
+    phone: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CompactCustomerData(_CompactModel):
+    model: ClassVar[type[BaseModel]] = CustomerData
+
+    name: str
+    contact_info: CompactContactInfo
+    customer_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CompactPaymentData(_CompactModel):
+    model: ClassVar[type[BaseModel]] = PaymentData
+
+    amount: int
+    source: str
+    currency: str = "USD"
+    type: PaymentType = PaymentType.ONLINE
+    idempotency_key: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CompactPaymentResponse(_CompactModel):
+    model: ClassVar[type[BaseModel]] = PaymentResponse
+
+    status: str
+    amount: int
+    transaction_id: Optional[str] = None
+    message: Optional[str] = None
+    retryable: bool = False
+
+
+_COMPACT_TYPES: dict[type[BaseModel], type[_CompactModel]] = {
+    ContactInfo: CompactContactInfo,
+    CustomerData: CompactCustomerData,
+    PaymentData: CompactPaymentData,
+    PaymentResponse: CompactPaymentResponse,
+}
+
+
+def _compact(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return _COMPACT_TYPES[type(value)].from_model(value)
+    return value
+
+
+def _dump(value: Any, mode: str) -> Any:
+    if isinstance(value, _CompactModel):
+        return value.model_dump(mode)
+    if mode == "json" and isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def to_compact(model: BaseModel):
+    """
+    Converts a Pydantic model from `commons` to its compact counterpart.
+    """
+    return _compact(model)
+
+
+def to_model(value: Any) -> Any:
+    """
+    Converts a compact object back to its validated Pydantic model; models
+    and None are returned unchanged.
+    """
+    if isinstance(value, _CompactModel):
+        return value.to_model()
+    return value
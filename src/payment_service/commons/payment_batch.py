@@ -0,0 +1,199 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from src.payment_service.commons.compact import CompactPaymentData
+from src.payment_service.commons.payment_data import PaymentType
+
+_TYPES: tuple[PaymentType, ...] = tuple(PaymentType)
+_TYPE_CODES: dict[PaymentType, int] = {
+    payment_type: code for code, payment_type in enumerate(_TYPES)
+}
+
+
+@dataclass
+class _PaymentColumns:
+    """
+    Storage shared by a batch and all the views taken from it. Currencies are
+    interned: each row stores a code into `currencies`.
+    """
+
+    amounts: array = field(default_factory=lambda: array("q"))
+    sources: list[str] = field(default_factory=list)
+    currency_codes: array = field(default_factory=lambda: array("H"))
+    type_codes: array = field(default_factory=lambda: array("B"))
+    currencies: list[str] = field(default_factory=list)
+    currency_index: dict[str, int] = field(default_factory=dict)
+
+    def currency_code(self, currency: str) -> int:
+        code = self.currency_index.get(currency)
+        if code is None:
+            code = self.currency_index[currency] = len(self.currencies)
+            self.currencies.append(currency)
+        return code
+
+
+class PaymentBatch:
+    """
+    Columnar container for many payments of a bulk workload.
+
+    Amounts, currency codes and type codes live in contiguous `array`s and
+    sources in a list, instead of one `PaymentData` object per row. Slicing
+    returns a view over the same storage without copying; `filter` returns a
+    view holding only the selected row indices. Only a batch that is not a
+    view can be appended to.
+
+    Indexing or iterating yields `CompactPaymentData` rows, which the rest of
+    the service accepts in place of `PaymentData`.
+    """
+
+    __slots__ = ("_columns", "_rows")
+
+    def __init__(
+            self,
+            _columns: Optional[_PaymentColumns] = None,
+            _rows: Union[range, array, None] = None,
+    ):
+        self._columns = _columns or _PaymentColumns()
+        # None for the whole batch, a range for slices, an index array for
+        # filtered views.
+        self._rows = _rows
+
+    @classmethod
+    def from_payments(cls, payments: Iterable) -> "PaymentBatch":
+        batch = cls()
+        for payment in payments:
+            batch.append(
+                payment.amount, payment.source, payment.currency, payment.type
+            )
+        return batch
+
+    @classmethod
+    def from_columns(
+            cls,
+            amounts: Sequence[int],
+            sources: Sequence[str],
+            currencies: Sequence[str],
+            types: Optional[Sequence[PaymentType]] = None,
+    ) -> "PaymentBatch":
+        if not len(amounts) == len(sources) == len(currencies):
+            raise ValueError("All columns must have the same length")
+        if types is not None and len(types) != len(amounts):
+            raise ValueError("All columns must have the same length")
+        columns = _PaymentColumns(amounts=array("q", amounts), sources=list(sources))
+        columns.currency_codes = array(
+            "H", map(columns.currency_code, currencies)
+        )
+        columns.type_codes = (
+            array("B", (_TYPE_CODES[payment_type] for payment_type in types))
+            if types is not None
+            else array("B", bytes([_TYPE_CODES[PaymentType.ONLINE]]) * len(amounts))
+        )
+        return cls(columns)
+
+    def append(
+            self,
+            amount: int,
+            source: str,
+            currency: str = "USD",
+            payment_type: PaymentType = PaymentType.ONLINE,
+    ):
+        if self._rows is not None:
+            raise ValueError("Cannot append to a view of a PaymentBatch")
+        columns = self._columns
+        columns.amounts.append(amount)
+        columns.sources.append(source)
+        columns.currency_codes.append(columns.currency_code(currency))
+        columns.type_codes.append(_TYPE_CODES[payment_type])
+
+    def __len__(self) -> int:
+        if self._rows is None:
+            return len(self._columns.amounts)
+        return len(self._rows)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return PaymentBatch(self._columns, self._row_indices()[item])
+        return self._row(self._row_indices()[item])
+
+    def __iter__(self) -> Iterator[CompactPaymentData]:
+        return map(self._row, self._row_indices())
+
+    def filter(self, mask: Sequence[int]) -> "PaymentBatch":
+        """
+        Returns a view of the rows whose `mask` entry is truthy, for example
+        the `mask` of a `ValidationReport`.
+        """
+        if len(mask) != len(self):
+            raise ValueError("The mask must have one entry per row")
+        return PaymentBatch(
+            self._columns,
+            array("L", (row for row, keep in zip(self._row_indices(), mask) if keep)),
+        )
+
+    def routes(self) -> dict[tuple[PaymentType, str], "PaymentBatch"]:
+        """
+        Splits the batch into views by `(payment type, currency)`, the keys
+        processors are chosen by.
+        """
+        columns = self._columns
+        type_codes, currency_codes = columns.type_codes, columns.currency_codes
+        groups: dict[tuple[int, int], array] = {}
+        for row in self._row_indices():
+            key = (type_codes[row], currency_codes[row])
+            rows = groups.get(key)
+            if rows is None:
+                rows = groups[key] = array("L")
+            rows.append(row)
+        return {
+            (_TYPES[type_code], columns.currencies[currency_code]): PaymentBatch(
+                columns, rows
+            )
+            for (type_code, currency_code), rows in groups.items()
+        }
+
+    @property
+    def amounts(self) -> Sequence[int]:
+        """
+        The amount column; a zero-copy memoryview unless the batch is filtered.
+        The batch cannot be appended to while such a view is alive.
+        """
+        return self._gather(self._columns.amounts)
+
+    @property
+    def sources(self) -> Sequence[str]:
+        return self._gather(self._columns.sources)
+
+    @property
+    def currencies(self) -> list[str]:
+        vocabulary = self._columns.currencies
+        return [vocabulary[code] for code in self._gather(self._columns.currency_codes)]
+
+    @property
+    def types(self) -> list[PaymentType]:
+        return [_TYPES[code] for code in self._gather(self._columns.type_codes)]
+
+    def total_amount(self) -> int:
+        return sum(self.amounts)
+
+    def _row(self, row: int) -> CompactPaymentData:
+        columns = self._columns
+        return CompactPaymentData(
+            columns.amounts[row],
+            columns.sources[row],
+            columns.currencies[columns.currency_codes[row]],
+            _TYPES[columns.type_codes[row]],
+        )
+
+    def _row_indices(self) -> Union[range, array]:
+        if self._rows is None:
+            return range(len(self._columns.amounts))
+        return self._rows
+
+    def _gather(self, column):
+        rows = self._row_indices()
+        if isinstance(rows, range) and rows.step == 1:
+            if isinstance(column, array):
+                return memoryview(column)[rows.start:rows.stop]
+            return column[rows.start:rows.stop]
+        return [column[row] for row in rows]
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -13,3 +14,4 @@ class PaymentData(BaseModel):
     source: str
     currency: str = "USD"
     type: PaymentType = PaymentType.ONLINE
+    idempotency_key: Optional[str] = None
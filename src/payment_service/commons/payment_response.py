@@ -8,3 +8,4 @@ class PaymentResponse(BaseModel):
     amount: int
     transaction_id: Optional[str] = None
     message: Optional[str] = None
+    retryable: bool = False
@@ -1,13 +1,44 @@
+from enum import Enum
+
 from src.payment_service.commons import CustomerData
-from src.payment_service.notifiers import SMSNotifier, EmailNotifier, NotifierProtocol
+from src.payment_service.notifiers import (
+    AsyncNotifierProtocol,
+    SMSNotifier,
+    EmailNotifier,
+    NotifierProtocol,
+    as_async_notifier,
+)
+
+
+class NotifierKind(Enum):
+    SMS = "sms"
+    EMAIL = "email"
 
 
 class NotifierFactory:
     @staticmethod
-    def create_notifier(customer_data: CustomerData) -> NotifierProtocol:
+    def notifier_kind(customer_data: CustomerData) -> NotifierKind:
         if customer_data.contact_info.phone:
-            return SMSNotifier("YourSMSService")
+            return NotifierKind.SMS
         if customer_data.contact_info.email:
-            return EmailNotifier()
+            return NotifierKind.EMAIL
         else:
             raise ValueError("No valid contact info provided")
+
+    @staticmethod
+    def create_notifier_of_kind(kind: NotifierKind) -> NotifierProtocol:
+        match kind:
+            case NotifierKind.SMS:
+                return SMSNotifier("YourSMSService")
+            case NotifierKind.EMAIL:
+                return EmailNotifier()
+
+    @staticmethod
+    def create_notifier(customer_data: CustomerData) -> NotifierProtocol:
+        return NotifierFactory.create_notifier_of_kind(
+            NotifierFactory.notifier_kind(customer_data)
+        )
+
+    @staticmethod
+    def create_async_notifier(customer_data: CustomerData) -> AsyncNotifierProtocol:
+        return as_async_notifier(NotifierFactory.create_notifier(customer_data))
@@ -1,25 +1,164 @@
-from src.payment_service.commons import PaymentData
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Iterator, Optional
+
+from src.payment_service.commons import PaymentBatch, PaymentData
 from src.payment_service.commons.payment_data import PaymentType
 from src.payment_service.processors import (
+    AsyncPaymentProcessorProtocol,
     PaymentProcessorProtocol,
     LocalPaymentProcessor,
-    StripePaymentProcessor,
     OfflinePaymentProcessor,
+    as_async_processor,
 )
 
+# A route is `(payment type, currency)`; a None currency matches any currency
+# without a route of its own.
+Route = tuple[PaymentType, Optional[str]]
+
+
+@dataclass
+class _Registration:
+    provider: Callable[[], PaymentProcessorProtocol]
+    per_thread: bool = False
+    blocking: bool = False
+    instance: Optional[PaymentProcessorProtocol] = None
+    # Per-thread instances live with their registration, so replacing a
+    # route can never hand out a processor of the route it replaced.
+    thread_instances: threading.local = field(default_factory=threading.local)
+
 
 class PaymentProcessorFactory:
+    """
+    Hands out processors by route from a registry.
+
+    Each registered processor is created on first use and then reused, once
+    per process or, with `per_thread`, once per thread, so connection pools
+    and caches survive across requests. Resolved routes are memoized in a
+    lookup table, so after the first payment of a given type and currency
+    resolving is a single dict lookup.
+    """
+
+    _registry: ClassVar[dict[Route, _Registration]] = {}
+    _routes: ClassVar[dict[tuple[PaymentType, str], _Registration]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def register(
+            cls,
+            payment_type: PaymentType,
+            provider: Callable[[], PaymentProcessorProtocol],
+            currency: Optional[str] = None,
+            per_thread: bool = False,
+            blocking: bool = False,
+    ):
+        """
+        Registers `provider` for a route, replacing any processor registered
+        for it before. `blocking` marks processors doing network I/O, which
+        the async service runs in a thread instead of inline.
+        """
+        with cls._lock:
+            cls._registry[(payment_type, currency)] = _Registration(
+                provider, per_thread, blocking
+            )
+            cls._routes.clear()
+
+    @classmethod
+    def clear_instances(cls):
+        """
+        Drops the cached processors; the next resolve creates new ones.
+        """
+        with cls._lock:
+            for registration in cls._registry.values():
+                registration.instance = None
+                registration.thread_instances = threading.local()
+
+    @classmethod
+    def resolve(
+            cls, payment_type: PaymentType, currency: str
+    ) -> PaymentProcessorProtocol:
+        return cls._instance(cls._registration(payment_type, currency))
+
+    @classmethod
+    def create_payment_processor(
+            cls, payment_data: PaymentData
+    ) -> PaymentProcessorProtocol:
+        return cls.resolve(payment_data.type, payment_data.currency)
+
+    @classmethod
+    def route_batch(
+            cls, batch: PaymentBatch
+    ) -> Iterator[tuple[PaymentProcessorProtocol, PaymentBatch]]:
+        """
+        Splits a batch by route and yields each part with the processor for
+        it, resolving the processor once per route instead of once per row.
+        """
+        for (payment_type, currency), rows in batch.routes().items():
+            yield cls.resolve(payment_type, currency), rows
 
-    @staticmethod
-    def create_payment_processor(payment_data: PaymentData) -> PaymentProcessorProtocol:
-        match payment_data.type:
-            case PaymentType.OFFLINE:
-                return OfflinePaymentProcessor()
-            case PaymentType.ONLINE:
-                match payment_data.currency:
-                    case "USD":
-                        return StripePaymentProcessor()
-                    case _:
-                        return LocalPaymentProcessor()
-            case _:
+    @classmethod
+    def create_async_payment_processor(
+            cls, payment_data: PaymentData
+    ) -> AsyncPaymentProcessorProtocol:
+        registration = cls._registration(payment_data.type, payment_data.currency)
+        # Only blocking processors (Stripe) do network I/O; the others answer
+        # immediately and are cheaper to call inline than to hand off to a
+        # thread.
+        return as_async_processor(
+            cls._instance(registration), blocking=registration.blocking
+        )
+
+    @classmethod
+    def _registration(cls, payment_type: PaymentType, currency: str) -> _Registration:
+        registration = cls._routes.get((payment_type, currency))
+        if registration is None:
+            registration = cls._lookup(payment_type, currency)
+        return registration
+
+    @classmethod
+    def _instance(cls, registration: _Registration) -> PaymentProcessorProtocol:
+        if registration.per_thread:
+            return cls._thread_instance(registration)
+        instance = registration.instance
+        if instance is None:
+            with cls._lock:
+                if registration.instance is None:
+                    registration.instance = registration.provider()
+                instance = registration.instance
+        return instance
+
+    @classmethod
+    def _lookup(cls, payment_type: PaymentType, currency: str) -> _Registration:
+        with cls._lock:
+            registration = cls._registry.get(
+                (payment_type, currency)
+            ) or cls._registry.get((payment_type, None))
+            if registration is None:
                 raise ValueError("Invalid payment type")
+            cls._routes[(payment_type, currency)] = registration
+            return registration
+
+    @classmethod
+    def _thread_instance(
+            cls, registration: _Registration
+    ) -> PaymentProcessorProtocol:
+        instances = registration.thread_instances
+        try:
+            return instances.processor
+        except AttributeError:
+            instances.processor = registration.provider()
+            return instances.processor
+
+
+def _create_stripe_processor() -> PaymentProcessorProtocol:
+    # Imported on first use: see the lazy attributes of `processors`.
+    from src.payment_service.processors import StripePaymentProcessor
+
+    return StripePaymentProcessor()
+
+
+PaymentProcessorFactory.register(PaymentType.OFFLINE, OfflinePaymentProcessor)
+PaymentProcessorFactory.register(
+    PaymentType.ONLINE, _create_stripe_processor, "USD", blocking=True
+)
+PaymentProcessorFactory.register(PaymentType.ONLINE, LocalPaymentProcessor)
@@ -0,0 +1,11 @@
+from src.payment_service.idempotency.keys import (
+    new_idempotency_key,
+    with_idempotency_key,
+)
+from src.payment_service.idempotency.store import IdempotencyStore
+
+__all__ = [
+    "IdempotencyStore",
+    "new_idempotency_key",
+    "with_idempotency_key",
+]
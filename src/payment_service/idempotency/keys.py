@@ -0,0 +1,23 @@
+import uuid
+
+from src.payment_service.commons import PaymentData
+
+
+def new_idempotency_key(prefix: str = "charge") -> str:
+    """
+    A fresh key for one request. Two calls never return the same key, so
+    two legitimate requests with equal contents are never merged.
+    """
+    return f"{prefix}-{uuid.uuid4().hex}"
+
+
+def with_idempotency_key(payment_data: PaymentData) -> PaymentData:
+    """
+    Returns `payment_data` with an idempotency key, keeping the caller's or
+    setting a fresh one, so retries of this one request share a key.
+    """
+    if payment_data.idempotency_key:
+        return payment_data
+    return payment_data.model_copy(
+        update={"idempotency_key": new_idempotency_key()}
+    )
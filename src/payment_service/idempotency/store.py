@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from src.payment_service.commons import PaymentResponse
+
+
+@dataclass
+class _Entry:
+    expires_at: float
+    response: Optional[PaymentResponse] = None
+
+
+class IdempotencyStore:
+    """
+    In-memory table of in-flight and completed requests by idempotency key.
+
+    `begin` claims a key and returns None, or returns the stored response of
+    a request that already completed within `window` seconds. A duplicate
+    arriving while the first request is still in flight waits up to
+    `wait_timeout` seconds for its result. Failed responses are not stored,
+    so retries after a failure reach the processor again.
+    """
+
+    def __init__(self, window: float = 24 * 3600, wait_timeout: float = 30.0):
+        self.window = window
+        self.wait_timeout = wait_timeout
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._condition = threading.Condition()
+
+    def begin(self, key: str) -> Optional[PaymentResponse]:
+        deadline = time.monotonic() + self.wait_timeout
+        with self._condition:
+            self._purge_expired()
+            while (entry := self._entries.get(key)) and entry.response is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ValueError(f"Request {key} is already in progress")
+                self._condition.wait(remaining)
+            if entry:
+                return entry.response
+            self._entries[key] = _Entry(expires_at=time.monotonic() + self.window)
+            return None
+
+    def complete(self, key: str, response: PaymentResponse):
+        with self._condition:
+            if response.status == "failed":
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = _Entry(
+                    expires_at=time.monotonic() + self.window, response=response
+                )
+                self._entries.move_to_end(key)
+            self._condition.notify_all()
+
+    def release(self, key: str):
+        """
+        Forgets an in-flight key whose request raised.
+        """
+        with self._condition:
+            self._entries.pop(key, None)
+            self._condition.notify_all()
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                return
+            del self._entries[key]
@@ -0,0 +1,58 @@
+import importlib
+from typing import TYPE_CHECKING
+
+from src.payment_service.instrumentation.histogram import (
+    HistogramSnapshot,
+    LatencyHistogram,
+)
+from src.payment_service.instrumentation.instrumentation import (
+    HistogramInstrumentation,
+    InstrumentationProtocol,
+    NoopInstrumentation,
+)
+from src.payment_service.instrumentation.metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+from src.payment_service.instrumentation.payment_metrics import (
+    MetricsInstrumentation,
+    PaymentMetrics,
+    processor_label,
+)
+
+if TYPE_CHECKING:
+    from src.payment_service.instrumentation.exporter import MetricsServer
+
+# The exporter pulls in http.server, which only processes serving metrics need.
+_LAZY_ATTRIBUTES = {
+    "MetricsServer": "src.payment_service.instrumentation.exporter",
+}
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "HistogramInstrumentation",
+    "HistogramSnapshot",
+    "InstrumentationProtocol",
+    "LatencyHistogram",
+    "MetricsInstrumentation",
+    "MetricsRegistry",
+    "MetricsServer",
+    "NoopInstrumentation",
+    "PaymentMetrics",
+    "REGISTRY",
+    "processor_label",
+]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,116 @@
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """
+    Point-in-time copy of a `LatencyHistogram`. Values are in nanoseconds.
+    """
+
+    count: int
+    total: int
+    min: int
+    max: int
+    sub_bucket_bits: int
+    counts: tuple[int, ...]
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> int:
+        """
+        Returns the highest value of the bucket holding the given percentile,
+        at most `max`; 0 for an empty histogram.
+        """
+        if not self.count:
+            return 0
+        target = max(1, round(percent / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(_bucket_high(index, self.sub_bucket_bits), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ns": self.mean,
+            "min_ns": self.min,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "p999_ns": self.percentile(99.9),
+            "max_ns": self.max,
+        }
+
+
+def _bucket_high(index: int, sub_bucket_bits: int) -> int:
+    sub_buckets = 1 << sub_bucket_bits
+    shift = max(0, index // sub_buckets - 1)
+    return ((index - shift * sub_buckets) << shift) + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of non-negative integer values (nanoseconds).
+
+    Values below `2**sub_bucket_bits` get a bucket each; every power-of-two
+    range above is split into `2**sub_bucket_bits` linear buckets, so the
+    relative error stays below `2**-sub_bucket_bits` at any magnitude while
+    recording is a bit-length, a shift and an increment. Values above
+    `highest_value` are counted in the last bucket.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7, highest_value: int = 3_600 * 10**9):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub_buckets = 1 << sub_bucket_bits
+        self._highest_index = self._index(highest_value)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, value: int):
+        if value < self._sub_buckets:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - self.sub_bucket_bits - 1
+            index = (shift << self.sub_bucket_bits) + (value >> shift)
+            if index > self._highest_index:
+                index = self._highest_index
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total += value
+            if value < self._min:
+                self._min = value
+            if value > self._max:
+                self._max = value
+
+    def reset(self):
+        self._counts = [0] * (self._highest_index + 1)
+        self._count = 0
+        self._total = 0
+        self._min = 1 << 63
+        self._max = 0
+
+    def snapshot(self, reset: bool = False) -> HistogramSnapshot:
+        with self._lock:
+            snapshot = HistogramSnapshot(
+                count=self._count,
+                total=self._total,
+                min=self._min if self._count else 0,
+                max=self._max,
+                sub_bucket_bits=self.sub_bucket_bits,
+                counts=tuple(self._counts),
+            )
+            if reset:
+                self.reset()
+        return snapshot
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_buckets:
+            return max(value, 0)
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return shift * self._sub_buckets + (value >> shift)
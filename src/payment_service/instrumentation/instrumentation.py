@@ -0,0 +1,91 @@
+import contextlib
+import threading
+import time
+from typing import ContextManager, Protocol
+
+from src.payment_service.instrumentation.histogram import (
+    HistogramSnapshot,
+    LatencyHistogram,
+)
+
+
+class InstrumentationProtocol(Protocol):
+    """
+    Receives the duration of each pipeline stage of the services.
+
+    `stage` returns a context manager timing the block it wraps. Stage names
+    used by `PaymentService` are `validate_customer`, `validate_payment`,
+    `rules`, `process`, `log`, `notify`, `refund`, `log_refund`, `recurring`
+    and `total` for a whole transaction.
+    """
+
+    def stage(self, name: str) -> ContextManager: ...
+
+
+class NoopInstrumentation(InstrumentationProtocol):
+    """
+    Default instrumentation: hands out one shared context manager that does
+    nothing, so an uninstrumented service neither reads the clock nor
+    allocates per stage.
+    """
+
+    _NOOP = contextlib.nullcontext()
+
+    def stage(self, name: str) -> ContextManager:
+        return self._NOOP
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.record(time.perf_counter_ns() - self.start)
+
+
+class HistogramInstrumentation(InstrumentationProtocol):
+    """
+    Records stage durations from the monotonic clock into one
+    `LatencyHistogram` per stage, including stages that raised.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> ContextManager:
+        return _StageTimer(self._histograms.get(name) or self.histogram(name))
+
+    def record(self, name: str, duration_ns: int):
+        self.histogram(name).record(duration_ns)
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    name, LatencyHistogram(self.sub_bucket_bits)
+                )
+        return histogram
+
+    def snapshot(self, reset: bool = False) -> dict[str, HistogramSnapshot]:
+        return {
+            name: histogram.snapshot(reset)
+            for name, histogram in list(self._histograms.items())
+        }
+
+    def export(self, reset: bool = False) -> dict[str, dict[str, float]]:
+        """
+        Summary statistics per stage, ready to be serialized as JSON.
+        """
+        return {
+            name: snapshot.to_dict()
+            for name, snapshot in self.snapshot(reset).items()
+        }
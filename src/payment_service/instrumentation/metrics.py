@@ -0,0 +1,308 @@
+import math
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Callable, Iterator, Optional, Sequence
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+
+
+class _CellOwner:
+    """
+    Lives in the owning thread's local storage, so it is collected when the
+    thread exits and its finalizer can retire the thread's cell.
+    """
+
+    __slots__ = ("cell", "__weakref__")
+
+    def __init__(self, cell: list[float]):
+        self.cell = cell
+
+
+class _Sharded:
+    """
+    Accumulators with one cell per thread.
+
+    Each thread only ever writes its own cell, so updates need no lock; the
+    lock is taken once per thread to register its cell, and on collection to
+    sum the cells up. When a thread exits, its cell is folded into `_retired`
+    and dropped, so short-lived worker threads do not pile up cells.
+    """
+
+    __slots__ = ("_size", "_local", "_cells", "_retired", "_lock", "__weakref__")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._cells: dict[int, list[float]] = {}
+        self._retired: list[float] = [0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> list[float]:
+        try:
+            return self._local.owner.cell
+        except AttributeError:
+            cell = [0] * self._size
+            owner = self._local.owner = _CellOwner(cell)
+            with self._lock:
+                self._cells[id(cell)] = cell
+            weakref.finalize(owner, _retire, weakref.ref(self), cell)
+            return cell
+
+    def totals(self) -> list[float]:
+        with self._lock:
+            return [
+                sum(column)
+                for column in zip(self._retired, *self._cells.values())
+            ]
+
+    def _retire(self, cell: list[float]):
+        with self._lock:
+            if self._cells.pop(id(cell), None) is not None:
+                self._retired = [
+                    total + value for total, value in zip(self._retired, cell)
+                ]
+
+
+def _retire(shards: "weakref.ref[_Sharded]", cell: list[float]):
+    sharded = shards()
+    if sharded is not None:
+        sharded._retire(cell)
+
+
+class CounterChild:
+    """
+    A monotonically increasing total, or one kept elsewhere and read by
+    `function` on every collection, e.g. a logger's count of dropped records.
+    """
+
+    __slots__ = ("_shards", "function")
+
+    def __init__(self):
+        self._shards = _Sharded(1)
+        self.function: Optional[Callable[[], float]] = None
+
+    def inc(self, amount: float = 1):
+        self._shards.cell()[0] += amount
+
+    def set_function(self, function: Callable[[], float]):
+        self.function = function
+
+    @property
+    def value(self) -> float:
+        return self.function() if self.function else self._shards.totals()[0]
+
+
+class GaugeChild:
+    """
+    A value that is set rather than accumulated, or computed by `function`
+    on every collection, e.g. to expose a queue depth at no cost per update.
+    """
+
+    __slots__ = ("_value", "_lock", "function")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self.function = function
+
+    @property
+    def value(self) -> float:
+        return self.function() if self.function else self._value
+
+
+class HistogramChild:
+    """
+    Prometheus histogram: per-bucket counts plus the sum of observations.
+    """
+
+    __slots__ = ("buckets", "_shards")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # One cell per bucket, one for +Inf, then the sum.
+        self._shards = _Sharded(len(buckets) + 2)
+
+    def observe(self, value: float):
+        cell = self._shards.cell()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def totals(self) -> tuple[list[int], float]:
+        totals = self._shards.totals()
+        return totals[:-1], totals[-1]
+
+
+class Metric:
+    """
+    A named metric with one child per combination of label values.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """
+        Returns the child for the label values, creating it on first use.
+        Hot paths should keep the child rather than look it up every time.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(
+                    f"{self.name} expects labels {self.label_names}, got {values}"
+                )
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        for values, child in list(self._children.items()):
+            yield from self._child_samples(dict(zip(self.label_names, values)), child)
+
+    def _child_samples(self, labels: dict[str, str], child):
+        yield self.name, labels, child.value
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str],
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def _child_samples(self, labels: dict[str, str], child: HistogramChild):
+        counts, total = child.totals()
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            bucket_labels = {**labels, "le": _format_value(bound)}
+            yield f"{self.name}_bucket", bucket_labels, cumulative
+        yield f"{self.name}_sum", labels, total
+        yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    """
+    Holds metrics and renders them in the Prometheus text exposition format.
+
+    Asking for an existing name returns the registered metric, so modules can
+    declare the metrics they use without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+            self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter, name, documentation, labels)
+
+    def gauge(
+            self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge, name, documentation, labels)
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            labels: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labels, buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric_type: type[Metric], name: str, *args) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, *args)
+            elif type(metric) is not metric_type:
+                raise ValueError(
+                    f"{name} is already registered as a {metric.type_name}"
+                )
+            return metric
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label(str(value))}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
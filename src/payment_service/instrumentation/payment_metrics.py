@@ -0,0 +1,207 @@
+import time
+from typing import Any, Callable, ContextManager
+
+from src.payment_service.commons import PaymentData, PaymentResponse
+from src.payment_service.instrumentation.instrumentation import (
+    InstrumentationProtocol,
+)
+from src.payment_service.instrumentation.metrics import (
+    REGISTRY,
+    HistogramChild,
+    MetricsRegistry,
+)
+
+_CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def processor_label(processor: Any) -> str:
+    """
+    Class name of the processor doing the work, looking through wrappers
+    such as the async adapter or `ResilientPaymentProcessor`.
+    """
+    while hasattr(processor, "processor"):
+        processor = processor.processor
+    return type(processor).__name__
+
+
+class PaymentMetrics:
+    """
+    The payment service's Prometheus metrics.
+
+    `PaymentService` reports every transaction and refund through
+    `transaction_completed` / `transaction_failed` / `refund_completed` /
+    `refund_failed`. Labelled children are looked up once per processor and
+    currency and then kept, so reporting is a dict lookup plus lock-free
+    per-thread increments. Loggers, outboxes and processors that keep their
+    own statistics are exposed with the `watch_*` methods, which read them
+    only when the metrics are scraped.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self.transactions = registry.counter(
+            "payment_transactions_total",
+            "Payment transactions by processor, currency and outcome.",
+            ("processor", "currency", "outcome"),
+        )
+        self.transaction_duration = registry.histogram(
+            "payment_transaction_duration_seconds",
+            "Time spent in the payment processor per transaction.",
+            ("processor", "currency"),
+        )
+        self.refunds = registry.counter(
+            "payment_refunds_total",
+            "Refunds by processor and outcome.",
+            ("processor", "outcome"),
+        )
+        self.stage_duration = registry.histogram(
+            "payment_stage_duration_seconds",
+            "Time spent in each stage of the payment pipeline.",
+            ("stage",),
+        )
+        self._transaction_children: dict[tuple[str, str], tuple] = {}
+
+    def transaction_completed(
+            self,
+            processor: Any,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+            seconds: float,
+    ):
+        succeeded, failed, _, duration = self._children(processor, payment_data)
+        (failed if payment_response.status == "failed" else succeeded).inc()
+        duration.observe(seconds)
+
+    def transaction_failed(self, processor: Any, payment_data: PaymentData):
+        """
+        Counts a transaction whose processor raised instead of answering.
+        """
+        self._children(processor, payment_data)[2].inc()
+
+    def refund_completed(self, processor: Any, refund_response: PaymentResponse):
+        outcome = "failed" if refund_response.status == "failed" else "success"
+        self.refunds.labels(processor_label(processor), outcome).inc()
+
+    def refund_failed(self, processor: Any):
+        self.refunds.labels(processor_label(processor), "error").inc()
+
+    def watch_logger(self, logger: Any, name: str = "transactions"):
+        """
+        Exposes the queue of a logger with `stats()`, such as
+        `BackgroundTransactionLogger`.
+        """
+        self._watch(
+            "payment_log_queue_depth",
+            "Records waiting for the log writer thread.",
+            name,
+            lambda: logger.stats().queue_depth,
+        )
+        self._watch(
+            "payment_log_lag_seconds",
+            "Age of the last record written by the log writer thread.",
+            name,
+            lambda: logger.stats().lag_seconds,
+        )
+        self.registry.counter(
+            "payment_log_dropped_records_total",
+            "Records dropped by the logger's backpressure policy.",
+            ("name",),
+        ).labels(name).set_function(lambda: logger.stats().dropped)
+
+    def watch_outbox(self, outbox: Any, name: str = "notifications"):
+        self._watch(
+            "payment_outbox_backlog",
+            "Notifications waiting in the outbox.",
+            name,
+            lambda: outbox.stats().backlog,
+        )
+
+    def watch_processor(self, processor: Any):
+        """
+        Exposes the circuit breaker of a `ResilientPaymentProcessor` and the
+        caches of a processor with `cache_stats()`, such as Stripe's.
+        """
+        label = processor_label(processor)
+        breaker = getattr(processor, "circuit_breaker", None)
+        if breaker is not None:
+            self._watch(
+                "payment_circuit_state",
+                "Circuit breaker state: 0 closed, 1 half open, 2 open.",
+                label,
+                lambda: _CIRCUIT_STATES[breaker.state.value],
+                label_name="processor",
+            )
+            processor = processor.processor
+        if hasattr(processor, "cache_stats"):
+            for cache in processor.cache_stats():
+                self._watch_cache(label, processor, cache)
+
+    def _watch_cache(self, label: str, processor: Any, cache: str):
+        for field, documentation in (
+                ("hits", "Processor cache hits."),
+                ("misses", "Processor cache misses."),
+                ("size", "Entries in the processor cache."),
+        ):
+            self.registry.gauge(
+                f"payment_processor_cache_{field}",
+                documentation,
+                ("processor", "cache"),
+            ).labels(label, cache).set_function(
+                lambda field=field: getattr(processor.cache_stats()[cache], field)
+            )
+
+    def _watch(
+            self,
+            name: str,
+            documentation: str,
+            label: str,
+            read: Callable[[], float],
+            label_name: str = "name",
+    ):
+        self.registry.gauge(name, documentation, (label_name,)).labels(
+            label
+        ).set_function(read)
+
+    def _children(self, processor: Any, payment_data: PaymentData) -> tuple:
+        label = processor_label(processor)
+        currency = payment_data.currency
+        children = self._transaction_children.get((label, currency))
+        if children is None:
+            children = self._transaction_children[(label, currency)] = (
+                self.transactions.labels(label, currency, "success"),
+                self.transactions.labels(label, currency, "failed"),
+                self.transactions.labels(label, currency, "error"),
+                self.transaction_duration.labels(label, currency),
+            )
+        return children
+
+
+class _StageObserver:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: HistogramChild):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class MetricsInstrumentation(InstrumentationProtocol):
+    """
+    Instrumentation feeding the stage timings into the
+    `payment_stage_duration_seconds` histogram of `metrics`.
+    """
+
+    def __init__(self, metrics: PaymentMetrics):
+        self.metrics = metrics
+        self._stages: dict[str, HistogramChild] = {}
+
+    def stage(self, name: str) -> ContextManager:
+        histogram = self._stages.get(name)
+        if histogram is None:
+            histogram = self._stages[name] = self.metrics.stage_duration.labels(name)
+        return _StageObserver(histogram)
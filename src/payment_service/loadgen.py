@@ -0,0 +1,285 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+from src.payment_service.builders.pool import PaymentServicePool
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.commons.payment_data import PaymentType
+from src.payment_service.instrumentation import LatencyHistogram
+from src.payment_service.service import PaymentService
+
+
+class OperationKind(Enum):
+    PAYMENT = "payment"
+    REFUND = "refund"
+    RECURRING = "recurring"
+
+
+class LoopMode(Enum):
+    # Issue operations on a fixed schedule regardless of how fast the service
+    # answers; latency includes the time spent waiting for a worker.
+    OPEN = "open"
+    # Each worker issues its next operation once the previous one finished.
+    CLOSED = "closed"
+
+
+@dataclass
+class TrafficMix:
+    """
+    Shape of the synthetic traffic. Ratios are fractions of all operations
+    (refunds, recurring) or of payments (offline) or customers (phone).
+    Amounts are log-normally distributed around `median_amount` minor units.
+    """
+
+    currencies: dict[str, float] = field(
+        default_factory=lambda: {"USD": 0.6, "EUR": 0.3, "GBP": 0.1}
+    )
+    offline_ratio: float = 0.1
+    phone_ratio: float = 0.3
+    refund_ratio: float = 0.05
+    recurring_ratio: float = 0.02
+    median_amount: int = 3_000
+    customers: int = 1_000
+
+
+@dataclass
+class Operation:
+    kind: OperationKind
+    customer_data: CustomerData
+    payment_data: PaymentData
+
+
+class TrafficGenerator:
+    """
+    Endless, reproducible stream of operations following a `TrafficMix`.
+    Customers are drawn from a fixed population so they repeat like real
+    ones do.
+    """
+
+    def __init__(self, mix: TrafficMix, seed: Optional[int] = None):
+        self.mix = mix
+        self._random = random.Random(seed)
+        self._currencies = list(mix.currencies)
+        self._currency_weights = list(mix.currencies.values())
+        self._customers = [
+            self._customer(number) for number in range(mix.customers)
+        ]
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[Operation]:
+        return self
+
+    def __next__(self) -> Operation:
+        with self._lock:
+            return self._operation()
+
+    def _operation(self) -> Operation:
+        draw = self._random.random()
+        if draw < self.mix.refund_ratio:
+            kind = OperationKind.REFUND
+        elif draw < self.mix.refund_ratio + self.mix.recurring_ratio:
+            kind = OperationKind.RECURRING
+        else:
+            kind = OperationKind.PAYMENT
+        offline = (
+            kind is OperationKind.PAYMENT
+            and self._random.random() < self.mix.offline_ratio
+        )
+        amount = self.mix.median_amount * self._random.lognormvariate(0, 1)
+        payment_data = PaymentData(
+            amount=max(50, int(amount)),
+            source="pm_card_visa" if kind is OperationKind.RECURRING else "tok_visa",
+            currency=self._random.choices(
+                self._currencies, self._currency_weights
+            )[0],
+            type=PaymentType.OFFLINE if offline else PaymentType.ONLINE,
+        )
+        return Operation(kind, self._random.choice(self._customers), payment_data)
+
+    def _customer(self, number: int) -> CustomerData:
+        if self._random.random() < self.mix.phone_ratio:
+            contact_info = ContactInfo(phone=f"+1555{number:07d}")
+        else:
+            contact_info = ContactInfo(email=f"customer{number}@example.com")
+        return CustomerData(
+            name=f"Customer {number}",
+            contact_info=contact_info,
+            customer_id=f"cus_load{number}",
+        )
+
+
+@dataclass
+class LoadReport:
+    mode: LoopMode
+    target_rate: Optional[float]
+    duration: float
+    completed: dict[OperationKind, int]
+    errors: dict[OperationKind, int]
+    latencies: dict[OperationKind, LatencyHistogram]
+
+    @property
+    def total(self) -> int:
+        return sum(self.completed.values())
+
+    @property
+    def achieved_tps(self) -> float:
+        return self.total / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode.value,
+            "target_rate": self.target_rate,
+            "duration_s": self.duration,
+            "operations": self.total,
+            "achieved_tps": self.achieved_tps,
+            "by_kind": {
+                kind.value: {
+                    "completed": self.completed[kind],
+                    "errors": self.errors[kind],
+                    **self.latencies[kind].snapshot().to_dict(),
+                }
+                for kind in OperationKind
+                if self.completed[kind]
+            },
+        }
+
+
+class LoadGenerator:
+    """
+    Drives a `PaymentServicePool` with operations from a `TrafficGenerator`.
+
+    Closed-loop mode runs `concurrency` workers back to back, which measures
+    the maximum throughput. Open-loop mode issues operations at `rate` per
+    second on a fixed schedule and measures latency from the scheduled start,
+    so a service that falls behind shows up as growing latency instead of a
+    silently lower request rate. Refunds target transactions that succeeded
+    earlier in the run and are replaced by payments until there are any.
+    """
+
+    def __init__(
+            self,
+            pool: PaymentServicePool,
+            traffic: TrafficGenerator,
+            concurrency: int = 8,
+    ):
+        self.pool = pool
+        self.traffic = traffic
+        self.concurrency = concurrency
+        self._refundable: deque[tuple[PaymentService, str]] = deque(
+            maxlen=10_000
+        )
+        self._completed = {kind: 0 for kind in OperationKind}
+        self._errors = {kind: 0 for kind in OperationKind}
+        self._latencies = {kind: LatencyHistogram() for kind in OperationKind}
+        self._lock = threading.Lock()
+
+    def run(
+            self,
+            duration: float,
+            rate: Optional[float] = None,
+            max_operations: Optional[int] = None,
+    ) -> LoadReport:
+        """
+        Runs open-loop at `rate` operations per second when given, closed-loop
+        otherwise, until `duration` seconds or `max_operations` have passed.
+        """
+        start = time.perf_counter()
+        if rate:
+            self._run_open(start, duration, rate, max_operations)
+            mode = LoopMode.OPEN
+        else:
+            self._run_closed(start, duration, max_operations)
+            mode = LoopMode.CLOSED
+        return LoadReport(
+            mode=mode,
+            target_rate=rate,
+            duration=time.perf_counter() - start,
+            completed=dict(self._completed),
+            errors=dict(self._errors),
+            latencies=self._latencies,
+        )
+
+    def _run_closed(
+            self, start: float, duration: float, max_operations: Optional[int]
+    ):
+        deadline = start + duration
+        issued = iter(range(max_operations)) if max_operations else None
+
+        def worker():
+            while time.perf_counter() < deadline:
+                if issued is not None and next(issued, None) is None:
+                    return
+                self._execute(next(self.traffic), time.perf_counter())
+
+        threads = [
+            threading.Thread(target=worker, name=f"load-{number}")
+            for number in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _run_open(
+            self,
+            start: float,
+            duration: float,
+            rate: float,
+            max_operations: Optional[int],
+    ):
+        interval = 1.0 / rate
+        with ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="load"
+        ) as executor:
+            issued = 0
+            while max_operations is None or issued < max_operations:
+                scheduled = start + issued * interval
+                if scheduled - start >= duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._execute, next(self.traffic), scheduled)
+                issued += 1
+
+    def _execute(self, operation: Operation, scheduled: float):
+        kind = operation.kind
+        try:
+            kind = self._dispatch(operation)
+            failed = False
+        except Exception:
+            failed = True
+        latency = time.perf_counter() - scheduled
+        self._latencies[kind].record(int(latency * 1e9))
+        with self._lock:
+            self._completed[kind] += 1
+            if failed:
+                self._errors[kind] += 1
+
+    def _dispatch(self, operation: Operation) -> OperationKind:
+        """
+        Runs the operation and returns the kind it was executed as.
+        """
+        service = self.pool.get(operation.customer_data, operation.payment_data)
+        if operation.kind is OperationKind.REFUND:
+            try:
+                refund_service, transaction_id = self._refundable.popleft()
+            except IndexError:
+                pass
+            else:
+                refund_service.process_refund(transaction_id)
+                return OperationKind.REFUND
+        if operation.kind is OperationKind.RECURRING:
+            service.setup_recurring(operation.customer_data, operation.payment_data)
+            return OperationKind.RECURRING
+        response = service.process_transaction(
+            operation.customer_data, operation.payment_data
+        )
+        if response.transaction_id and service.refund_processor:
+            self._refundable.append((service, response.transaction_id))
+        return OperationKind.PAYMENT
@@ -1,3 +1,34 @@
+from src.payment_service.loggers.background import (
+    BackgroundTransactionLogger,
+    BackpressurePolicy,
+    LoggerStats,
+)
+from src.payment_service.loggers.buffered import (
+    BufferedTransactionLogger,
+    FsyncPolicy,
+)
+from src.payment_service.loggers.ledger import LedgerEntry, TransactionLedger
+from src.payment_service.loggers.logger import TransactionLoggerProtocol
+from src.payment_service.loggers.reader import TransactionLogReader
+from src.payment_service.loggers.records import (
+    LogFormat,
+    RecordKind,
+    TransactionRecord,
+)
 from src.payment_service.loggers.transaction import TransactionLogger
 
-__all__ = ["TransactionLogger"]
+__all__ = [
+    "TransactionLoggerProtocol",
+    "TransactionLogger",
+    "BufferedTransactionLogger",
+    "FsyncPolicy",
+    "BackgroundTransactionLogger",
+    "BackpressurePolicy",
+    "LoggerStats",
+    "LogFormat",
+    "RecordKind",
+    "TransactionRecord",
+    "TransactionLogReader",
+    "TransactionLedger",
+    "LedgerEntry",
+]
@@ -0,0 +1,176 @@
+import atexit
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.loggers.logger import TransactionLoggerProtocol
+from src.payment_service.loggers.records import LogFormat
+from src.payment_service.loggers.transaction import TransactionLogger
+
+
+class BackpressurePolicy(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+@dataclass
+class LoggerStats:
+    enqueued: int
+    written: int
+    dropped: int
+    spilled: int
+    failed: int
+    queue_depth: int
+    lag_seconds: float
+
+
+@dataclass
+class BackgroundTransactionLogger(TransactionLoggerProtocol):
+    """
+    Transaction logger that hands records to a dedicated writer thread.
+
+    `log_transaction` and `log_refund` only enqueue the record; the writer
+    thread forwards it to `delegate`. When the queue is full, `backpressure`
+    decides whether the caller blocks, the oldest pending record is dropped,
+    or the record is written synchronously to `spill_path` instead.
+    """
+
+    delegate: TransactionLoggerProtocol = field(default_factory=TransactionLogger)
+    max_queue_size: int = 10_000
+    backpressure: BackpressurePolicy = BackpressurePolicy.BLOCK
+    spill_path: str = "transactions.spill.log"
+
+    _queue: queue.Queue = field(init=False, repr=False)
+    _thread: threading.Thread = field(init=False, repr=False)
+    _spill_logger: Optional[TransactionLogger] = field(
+        default=None, init=False, repr=False
+    )
+    _stats_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    # Makes "not closed yet" and the enqueue one step, so nothing can be
+    # queued behind the close sentinel, nor drop it.
+    _enqueue_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _enqueued: int = field(default=0, init=False, repr=False)
+    _written: int = field(default=0, init=False, repr=False)
+    _dropped: int = field(default=0, init=False, repr=False)
+    _spilled: int = field(default=0, init=False, repr=False)
+    _failed: int = field(default=0, init=False, repr=False)
+    _lag: float = field(default=0.0, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="transaction-log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ):
+        self._enqueue(
+            "log_transaction", (customer_data, payment_data, payment_response)
+        )
+
+    def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        self._enqueue("log_refund", (transaction_id, refund_response))
+
+    def stats(self) -> LoggerStats:
+        with self._stats_lock:
+            return LoggerStats(
+                enqueued=self._enqueued,
+                written=self._written,
+                dropped=self._dropped,
+                spilled=self._spilled,
+                failed=self._failed,
+                queue_depth=self._queue.qsize(),
+                lag_seconds=self._lag,
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops accepting records, drains the queue and closes the delegate.
+        """
+        with self._enqueue_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+        for logger in (self.delegate, self._spill_logger):
+            if hasattr(logger, "close"):
+                logger.close()
+        atexit.unregister(self.close)
+
+    def _enqueue(self, method: str, args: tuple[Any, ...]):
+        with self._enqueue_lock:
+            if self._closed:
+                raise ValueError("logger is closed")
+            self._put(method, args)
+
+    def _put(self, method: str, args: tuple[Any, ...]):
+        item = (method, args, time.monotonic())
+        if self.backpressure is BackpressurePolicy.BLOCK:
+            self._queue.put(item)
+            self._count("_enqueued")
+            return
+
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                self._count("_enqueued")
+                return
+            except queue.Full:
+                pass
+            if self.backpressure is BackpressurePolicy.SPILL:
+                self._spill(method, args)
+                return
+            try:
+                self._queue.get_nowait()
+                self._count("_dropped")
+            except queue.Empty:
+                pass
+
+    def _spill(self, method: str, args: tuple[Any, ...]):
+        if self._spill_logger is None:
+            self._spill_logger = TransactionLogger(
+                path=self.spill_path,
+                format=getattr(self.delegate, "format", LogFormat.TEXT),
+            )
+        getattr(self._spill_logger, method)(*args)
+        self._count("_spilled")
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            method, args, enqueued_at = item
+            try:
+                getattr(self.delegate, method)(*args)
+                written = True
+            except Exception as e:
+                print("Transaction log write failed:", e)
+                written = False
+            with self._stats_lock:
+                self._lag = time.monotonic() - enqueued_at
+                if written:
+                    self._written += 1
+                else:
+                    self._failed += 1
@@ -0,0 +1,99 @@
+import atexit
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import BinaryIO, Optional
+
+from src.payment_service.loggers.transaction import TransactionLogger
+
+
+class FsyncPolicy(Enum):
+    NONE = "none"
+    BATCH = "batch"
+    RECORD = "record"
+
+
+@dataclass
+class BufferedTransactionLogger(TransactionLogger):
+    """
+    Transaction logger that keeps the log file open and group-commits records.
+
+    Records are accumulated in memory and written in one go once
+    `max_buffer_records` are pending or `flush_interval` seconds have passed
+    since the last flush. `fsync` controls durability: `NONE` leaves it to the
+    OS, `BATCH` syncs after every group write and `RECORD` writes and syncs
+    each record before returning. Pending records are flushed on `close()`,
+    which is also registered to run at interpreter exit.
+    """
+
+    max_buffer_records: int = 256
+    flush_interval: Optional[float] = 1.0
+    fsync: FsyncPolicy = FsyncPolicy.BATCH
+
+    _buffer: list[bytes] = field(default_factory=list, init=False, repr=False)
+    _file: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+    _last_flush: float = field(default=0.0, init=False, repr=False)
+    _closed: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._file = open(self.path, "ab")
+        self._last_flush = time.monotonic()
+        atexit.register(self.close)
+        if self.flush_interval:
+            threading.Thread(
+                target=self._flush_periodically,
+                name="transaction-log-flusher",
+                daemon=True,
+            ).start()
+
+    def _write(self, record: bytes):
+        with self._lock:
+            if self._closed.is_set():
+                raise ValueError("logger is closed")
+            self._buffer.append(record)
+            if (
+                    self.fsync is FsyncPolicy.RECORD
+                    or len(self._buffer) >= self.max_buffer_records
+            ):
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._flush_locked()
+            self._closed.set()
+            self._file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        self._file.write(b"".join(self._buffer))
+        self._buffer.clear()
+        self._file.flush()
+        if self.fsync is not FsyncPolicy.NONE:
+            os.fsync(self._file.fileno())
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                with self._lock:
+                    if not self._closed.is_set():
+                        self._flush_locked()
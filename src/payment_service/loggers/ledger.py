@@ -0,0 +1,174 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.loggers.logger import TransactionLoggerProtocol
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id TEXT PRIMARY KEY,
+    customer_name TEXT,
+    amount INTEGER NOT NULL,
+    currency TEXT,
+    source TEXT,
+    status TEXT NOT NULL,
+    message TEXT,
+    created_at REAL NOT NULL,
+    refund_id TEXT,
+    refund_status TEXT,
+    refunded_at REAL
+)
+"""
+
+_REFUND_PENDING = "pending"
+_REFUND_FAILED = "failed"
+
+
+@dataclass
+class LedgerEntry:
+    transaction_id: str
+    customer_name: Optional[str]
+    amount: int
+    currency: Optional[str]
+    source: Optional[str]
+    status: str
+    message: Optional[str]
+    created_at: float
+    refund_id: Optional[str] = None
+    refund_status: Optional[str] = None
+    refunded_at: Optional[float] = None
+
+    @property
+    def refunded(self) -> bool:
+        return self.refund_status is not None
+
+
+@dataclass
+class TransactionLedger(TransactionLoggerProtocol):
+    """
+    Local SQLite ledger of charges keyed by `transaction_id`.
+
+    It is written by the logging step like any transaction logger and lets
+    refunds be checked against the original charge without a network call.
+    `reserve_refund` atomically marks a charge as being refunded so concurrent
+    or repeated refunds of the same charge are rejected.
+    """
+
+    path: str = "ledger.db"
+
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+
+    def log_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ):
+        if not payment_response.transaction_id:
+            return
+        with self._lock:
+            # Updates the charge in place: a refund reserved or recorded
+            # before the charge was (re)logged must not be lost.
+            self._connection.execute(
+                "INSERT INTO transactions (transaction_id, customer_name, "
+                "amount, currency, source, status, message, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(transaction_id) DO UPDATE SET "
+                "customer_name = excluded.customer_name, "
+                "amount = excluded.amount, currency = excluded.currency, "
+                "source = excluded.source, status = excluded.status, "
+                "message = excluded.message, created_at = excluded.created_at",
+                (
+                    payment_response.transaction_id,
+                    customer_data.name,
+                    payment_response.amount,
+                    payment_data.currency,
+                    payment_data.source,
+                    payment_response.status,
+                    payment_response.message,
+                    time.time(),
+                ),
+            )
+
+    def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
+        if refund_response.status == _REFUND_FAILED:
+            self.release_refund(transaction_id)
+            return
+        with self._lock:
+            self._connection.execute(
+                "UPDATE transactions SET refund_id = ?, refund_status = ?, "
+                "refunded_at = ? WHERE transaction_id = ?",
+                (
+                    refund_response.transaction_id,
+                    refund_response.status,
+                    time.time(),
+                    transaction_id,
+                ),
+            )
+
+    def get(self, transaction_id: str) -> Optional[LedgerEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM transactions WHERE transaction_id = ?",
+                (transaction_id,),
+            ).fetchone()
+        return LedgerEntry(*row) if row else None
+
+    def reserve_refund(self, transaction_id: str):
+        """
+        Marks the charge as being refunded, or raises `ValueError` if it failed
+        or was already refunded. Charges the ledger has never seen are
+        reserved too, so they can only be refunded once from now on.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO transactions (transaction_id, amount, "
+                "status, created_at) VALUES (?, 0, 'unknown', ?)",
+                (transaction_id, time.time()),
+            )
+            reserved = self._connection.execute(
+                "UPDATE transactions SET refund_status = ? WHERE transaction_id = ? "
+                "AND refund_status IS NULL AND status != ?",
+                (_REFUND_PENDING, transaction_id, _REFUND_FAILED),
+            ).rowcount
+            if reserved:
+                return
+            status, refund_status = self._connection.execute(
+                "SELECT status, refund_status FROM transactions "
+                "WHERE transaction_id = ?",
+                (transaction_id,),
+            ).fetchone()
+        if status == _REFUND_FAILED:
+            raise ValueError(f"Transaction {transaction_id} failed, nothing to refund")
+        raise ValueError(
+            f"Transaction {transaction_id} already refunded ({refund_status})"
+        )
+
+    def release_refund(self, transaction_id: str):
+        """
+        Clears a pending reservation after a refund attempt failed.
+        """
+        with self._lock:
+            self._connection.execute(
+                "UPDATE transactions SET refund_status = NULL "
+                "WHERE transaction_id = ? AND refund_status = ?",
+                (transaction_id, _REFUND_PENDING),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,21 @@
+from typing import Protocol
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class TransactionLoggerProtocol(Protocol):
+    """
+    Protocol for recording transactions and refunds.
+
+    This protocol defines the interface for transaction loggers. Implementations
+    decide where and when records are persisted.
+    """
+
+    def log_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ): ...
+
+    def log_refund(self, transaction_id: str, refund_response: PaymentResponse): ...
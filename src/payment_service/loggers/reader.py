@@ -0,0 +1,70 @@
+import mmap
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator
+
+from src.payment_service.loggers.records import (
+    LogFormat,
+    TransactionRecord,
+    decode_binary,
+    decode_jsonl,
+    frame_length,
+)
+
+
+@dataclass
+class TransactionLogReader:
+    """
+    Streams `TransactionRecord`s from a JSONL or binary transaction log.
+
+    Records are decoded lazily while iterating. With `use_mmap` the file is
+    memory-mapped and frames are decoded straight from the mapping instead of
+    being read into intermediate buffers.
+    """
+
+    path: str
+    format: LogFormat = LogFormat.JSONL
+    use_mmap: bool = False
+
+    def __post_init__(self):
+        if self.format is LogFormat.TEXT:
+            raise ValueError("The text log format can not be read back")
+
+    def __iter__(self) -> Iterator[TransactionRecord]:
+        with open(self.path, "rb") as log_file:
+            if self.use_mmap:
+                yield from self._iter_mapped(log_file)
+            elif self.format is LogFormat.JSONL:
+                for line in log_file:
+                    if line.strip():
+                        yield decode_jsonl(line)
+            else:
+                yield from self._iter_binary_stream(log_file)
+
+    def _iter_mapped(self, log_file: BinaryIO) -> Iterator[TransactionRecord]:
+        # mmap refuses empty files.
+        if not log_file.seek(0, 2):
+            return
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = len(mapped)
+            offset = 0
+            if self.format is LogFormat.JSONL:
+                while offset < size:
+                    end = mapped.find(b"\n", offset)
+                    if end == -1:
+                        end = size
+                    if end > offset:
+                        yield decode_jsonl(mapped[offset:end])
+                    offset = end + 1
+            else:
+                with memoryview(mapped) as view:
+                    while offset < size:
+                        record, offset = decode_binary(view, offset)
+                        yield record
+
+    def _iter_binary_stream(self, log_file: BinaryIO) -> Iterator[TransactionRecord]:
+        while header := log_file.read(4):
+            if len(header) < 4:
+                raise ValueError("Truncated binary transaction log")
+            frame = header + log_file.read(frame_length(header) - 4)
+            record, _ = decode_binary(frame)
+            yield record
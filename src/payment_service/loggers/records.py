@@ -0,0 +1,162 @@
+import json
+import struct
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class LogFormat(Enum):
+    TEXT = "text"
+    JSONL = "jsonl"
+    BINARY = "binary"
+
+
+class RecordKind(Enum):
+    TRANSACTION = "transaction"
+    REFUND = "refund"
+
+
+@dataclass(slots=True)
+class TransactionRecord:
+    """
+    One structured transaction log entry.
+
+    For refunds `transaction_id` is the refunded charge and `refund_id` the id
+    of the refund itself.
+    """
+
+    kind: RecordKind
+    timestamp: float
+    amount: int
+    status: str
+    customer_name: Optional[str] = None
+    currency: Optional[str] = None
+    transaction_id: Optional[str] = None
+    refund_id: Optional[str] = None
+    message: Optional[str] = None
+
+    @classmethod
+    def for_transaction(
+            cls,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ) -> "TransactionRecord":
+        return cls(
+            kind=RecordKind.TRANSACTION,
+            timestamp=time.time(),
+            amount=payment_data.amount,
+            status=payment_response.status,
+            customer_name=customer_data.name,
+            currency=payment_data.currency,
+            transaction_id=payment_response.transaction_id,
+            message=payment_response.message,
+        )
+
+    @classmethod
+    def for_refund(
+            cls, transaction_id: str, refund_response: PaymentResponse
+    ) -> "TransactionRecord":
+        return cls(
+            kind=RecordKind.REFUND,
+            timestamp=time.time(),
+            amount=refund_response.amount,
+            status=refund_response.status,
+            transaction_id=transaction_id,
+            refund_id=refund_response.transaction_id,
+            message=refund_response.message,
+        )
+
+
+# Binary frame: u32 body length, then the body: u8 kind, f64 timestamp,
+# i64 amount, followed by the string fields in `_STRING_FIELDS` order, each as
+# u16 length + UTF-8 bytes (0xFFFF marks None). All integers little-endian.
+_FRAME_HEADER = struct.Struct("<I")
+_BODY_HEADER = struct.Struct("<Bdq")
+_STRING_LENGTH = struct.Struct("<H")
+_NONE_LENGTH = 0xFFFF
+_STRING_FIELDS = (
+    "status",
+    "customer_name",
+    "currency",
+    "transaction_id",
+    "refund_id",
+    "message",
+)
+_KIND_CODES = {RecordKind.TRANSACTION: 0, RecordKind.REFUND: 1}
+_KINDS_BY_CODE = {code: kind for kind, code in _KIND_CODES.items()}
+
+
+def encode_jsonl(record: TransactionRecord) -> bytes:
+    fields = asdict(record)
+    fields["kind"] = record.kind.value
+    return json.dumps(fields, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_jsonl(line: bytes) -> TransactionRecord:
+    fields = json.loads(line)
+    fields["kind"] = RecordKind(fields["kind"])
+    return TransactionRecord(**fields)
+
+
+def encode_binary(record: TransactionRecord) -> bytes:
+    parts = [
+        _BODY_HEADER.pack(_KIND_CODES[record.kind], record.timestamp, record.amount)
+    ]
+    for name in _STRING_FIELDS:
+        value = getattr(record, name)
+        if value is None:
+            parts.append(_STRING_LENGTH.pack(_NONE_LENGTH))
+            continue
+        encoded = value.encode()
+        if len(encoded) >= _NONE_LENGTH:
+            raise ValueError(f"{name} is too long for the binary log format")
+        parts.append(_STRING_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+    body = b"".join(parts)
+    return _FRAME_HEADER.pack(len(body)) + body
+
+
+def decode_binary(buffer, offset: int = 0) -> tuple[TransactionRecord, int]:
+    """
+    Decodes the frame starting at `offset` of any buffer (bytes, mmap,
+    memoryview) and returns the record with the offset of the next frame.
+    """
+    (length,) = _FRAME_HEADER.unpack_from(buffer, offset)
+    position = offset + _FRAME_HEADER.size
+    end = position + length
+    kind_code, timestamp, amount = _BODY_HEADER.unpack_from(buffer, position)
+    position += _BODY_HEADER.size
+    strings = []
+    for _ in _STRING_FIELDS:
+        (size,) = _STRING_LENGTH.unpack_from(buffer, position)
+        position += _STRING_LENGTH.size
+        if size == _NONE_LENGTH:
+            strings.append(None)
+            continue
+        strings.append(str(buffer[position:position + size], "utf-8"))
+        position += size
+    if position != end:
+        raise ValueError(f"Corrupt binary log frame at offset {offset}")
+    record = TransactionRecord(_KINDS_BY_CODE[kind_code], timestamp, amount, "")
+    for name, value in zip(_STRING_FIELDS, strings):
+        setattr(record, name, value)
+    return record, end
+
+
+def frame_length(buffer, offset: int = 0) -> int:
+    (length,) = _FRAME_HEADER.unpack_from(buffer, offset)
+    return _FRAME_HEADER.size + length
+
+
+def encode_record(record: TransactionRecord, log_format: LogFormat) -> bytes:
+    match log_format:
+        case LogFormat.JSONL:
+            return encode_jsonl(record)
+        case LogFormat.BINARY:
+            return encode_binary(record)
+        case _:
+            raise ValueError(f"{log_format} is not a structured format")
@@ -1,22 +1,86 @@
+import threading
+from dataclasses import dataclass
+from typing import ClassVar, Iterable
+
 from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.loggers.logger import TransactionLoggerProtocol
+from src.payment_service.loggers.records import (
+    LogFormat,
+    TransactionRecord,
+    encode_record,
+)
+
 
+@dataclass
+class TransactionLogger(TransactionLoggerProtocol):
+    path: str = "transactions.log"
+    format: LogFormat = LogFormat.TEXT
+
+    # Records span several lines; concurrent writers (e.g. `process_batch`
+    # workers) must not interleave them.
+    _lock: ClassVar[threading.Lock] = threading.Lock()
 
-class TransactionLogger:
     def log_transaction(
             self,
             customer_data: CustomerData,
             payment_data: PaymentData,
             payment_response: PaymentResponse,
     ):
-        with open("transactions.log", "a") as log_file:
-            log_file.write(f"{customer_data.name} paid {payment_data.amount}\n")
-            log_file.write(f"Payment status: {payment_response.status}\n")
-            if payment_response.transaction_id:
-                log_file.write(f"Transaction ID: {payment_response.transaction_id}\n")
-            log_file.write(f"Message: {payment_response.message}\n")
+        self._write(
+            self._format_transaction(customer_data, payment_data, payment_response)
+        )
+
+    def log_transactions(
+            self,
+            transactions: Iterable[tuple[CustomerData, PaymentData, PaymentResponse]],
+    ):
+        """
+        Logs many transactions with a single write, e.g. the rows of a
+        `PaymentBatch` zipped with their customers and responses.
+        """
+        self._write(
+            b"".join(
+                self._format_transaction(customer_data, payment_data, payment_response)
+                for customer_data, payment_data, payment_response in transactions
+            )
+        )
 
     def log_refund(self, transaction_id: str, refund_response: PaymentResponse):
-        with open("transactions.log", "a") as log_file:
-            log_file.write(f"Refund processed for transaction {transaction_id}\n")
-            log_file.write(f"Refund status: {refund_response.status}\n")
-            log_file.write(f"Message: {refund_response.message}\n")
+        self._write(self._format_refund(transaction_id, refund_response))
+
+    def _format_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ) -> bytes:
+        if self.format is not LogFormat.TEXT:
+            return encode_record(
+                TransactionRecord.for_transaction(
+                    customer_data, payment_data, payment_response
+                ),
+                self.format,
+            )
+        record = f"{customer_data.name} paid {payment_data.amount}\n"
+        record += f"Payment status: {payment_response.status}\n"
+        if payment_response.transaction_id:
+            record += f"Transaction ID: {payment_response.transaction_id}\n"
+        record += f"Message: {payment_response.message}\n"
+        return record.encode()
+
+    def _format_refund(
+            self, transaction_id: str, refund_response: PaymentResponse
+    ) -> bytes:
+        if self.format is not LogFormat.TEXT:
+            return encode_record(
+                TransactionRecord.for_refund(transaction_id, refund_response),
+                self.format,
+            )
+        record = f"Refund processed for transaction {transaction_id}\n"
+        record += f"Refund status: {refund_response.status}\n"
+        record += f"Message: {refund_response.message}\n"
+        return record.encode()
+
+    def _write(self, record: bytes):
+        with self._lock, open(self.path, "ab") as log_file:
+            log_file.write(record)
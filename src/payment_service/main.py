@@ -1,237 +1,159 @@
-from dotenv import load_dotenv
-
-from src.payment_service.builders.builders import PaymentServiceBuilder
-from src.payment_service.commons import CustomerData, ContactInfo, PaymentData
+"""
+Synthetic load generator for the payment service.
+
+    python -m src.payment_service.main --duration 10 --concurrency 8
+    python -m src.payment_service.main --rate 500 --duration 30 --output run.json
+
+Without `--rate` the generator runs closed-loop and reports the maximum
+throughput; with it, operations are issued open-loop at that rate and their
+latency counts from when they were due. Traffic mixes currencies, online and
+offline payments, email and phone customers, refunds and recurring set-ups.
+Processors and notifiers are in-process stubs unless `--real-processors` is
+given, so the default run needs no network access or API keys.
+"""
+import argparse
+import json
+import os
+import tempfile
+from typing import Any
+
+from src.payment_service.benchmarks.stubs import StubNotifier, StubPaymentProcessor
+from src.payment_service.builders.pool import PaymentServicePool
 from src.payment_service.commons.payment_data import PaymentType
-from src.payment_service.loggers import TransactionLogger
-from src.payment_service.notifiers import EmailNotifier, SMSNotifier, NotifierProtocol
-from src.payment_service.processors import (
-    StripePaymentProcessor,
-    OfflinePaymentProcessor,
+from src.payment_service.factories.payment_processor_factory import (
+    PaymentProcessorFactory,
 )
-from src.payment_service.service import PaymentService
-from src.payment_service.validators import CustomerValidator, PaymentDataValidator
-
-_ = load_dotenv()
-
-
-def get_email_notifier() -> EmailNotifier:
-    return EmailNotifier()
-
-
-def get_sms_notifier() -> SMSNotifier:
-    sms_gateway = "YourSMSService"
-    return SMSNotifier(sms_gateway)
-
-
-def get_notifier_implementation(customer_data: CustomerData) -> NotifierProtocol:
-    if customer_data.contact_info.phone:
-        return get_sms_notifier()
-    if customer_data.contact_info.email:
-        return get_email_notifier()
-    else:
-        raise ValueError("No valid contact info provided")
-
-
-def get_customer_data() -> CustomerData:
-    customer_data_with_phone = CustomerData(
-        name="Jane Doe", contact_info=ContactInfo(phone="1234567890")
-    )
-
-    return customer_data_with_phone
-
-
-if __name__ == "__main__":
-    # Set up the payment processors
-    stripe_processor = StripePaymentProcessor()
-    offline_processor = OfflinePaymentProcessor()
-    customer_validator = CustomerValidator()
-    payment_validator = PaymentDataValidator()
-    logger = TransactionLogger()
-
-    # Set up the customer data and payment data
-    customer_data_with_email = CustomerData(
-        name="John Doe", contact_info=ContactInfo(email="john@example.com")
-    )
-    customer_data_with_phone = CustomerData(
-        name="Jane Doe", contact_info=ContactInfo(phone="1234567890")
-    )
+from src.payment_service.instrumentation import HistogramInstrumentation
+from src.payment_service.loadgen import (
+    LoadGenerator,
+    LoadReport,
+    TrafficGenerator,
+    TrafficMix,
+)
+from src.payment_service.loggers import TransactionLogger
 
-    # Set up the payment data
-    payment_data = PaymentData(amount=100, source="tok_visa")
 
-    # Set up the notifiers
-    email_notifier = EmailNotifier()
+def _register_stub_processors(args: argparse.Namespace):
+    processor = StubPaymentProcessor(args.processor_latency, args.failure_rate)
+    for payment_type, currency in (
+            (PaymentType.OFFLINE, None),
+            (PaymentType.ONLINE, "USD"),
+            (PaymentType.ONLINE, None),
+    ):
+        PaymentProcessorFactory.register(
+            payment_type, lambda: processor, currency=currency
+        )
+    PaymentProcessorFactory.clear_instances()
 
-    sms_gateway = "YourSMSService"
-    sms_notifier = SMSNotifier(sms_gateway)
 
-    # # Using Stripe processor with email notifier
-    payment_service_email = PaymentService(
-        payment_processor=stripe_processor,
-        notifier=email_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-        refund_processor=stripe_processor,
-        recurring_processor=stripe_processor,
-    )
+def _currencies(values: list[str]) -> dict[str, float]:
+    currencies = {}
+    for value in values:
+        currency, _, weight = value.partition("=")
+        currencies[currency.upper()] = float(weight or 1)
+    return currencies
 
-    payment_service_email.process_transaction(customer_data_with_email, payment_data)
 
-    # Using Stripe processor with SMS notifier
-    payment_service_sms = PaymentService(
-        payment_processor=stripe_processor,
-        notifier=sms_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-    )
-    sms_payment_response = payment_service_sms.process_transaction(
-        customer_data_with_phone, payment_data
-    )
-
-    # Example of processing a refund using Stripe processor
-    transaction_id_to_refund = sms_payment_response.transaction_id
-    if transaction_id_to_refund:
-        payment_service_email.process_refund(transaction_id_to_refund)
-
-    # Using offline processor with email notifier
-    offline_payment_service = PaymentService(
-        payment_processor=offline_processor,
-        notifier=email_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-    )
-    offline_payment_response = offline_payment_service.process_transaction(
-        customer_data_with_email, payment_data
+def _print(report: LoadReport, stages: dict[str, Any]):
+    target = f" (target {report.target_rate:,.0f}/s)" if report.target_rate else ""
+    print(
+        f"{report.mode.value}-loop: {report.total} operations in "
+        f"{report.duration:.2f}s, {report.achieved_tps:,.0f} tx/s{target}"
     )
-
-    # Attempt to refund using offline processor (will fail)
-    try:
-        if offline_payment_response.transaction_id:
-            offline_payment_service.process_refund(
-                offline_payment_response.transaction_id
-            )
-    except Exception as e:
-        print(f"Refund failed and PaymentService raised an exception: {e}")
-
-    # Attempt to set up recurring payment using offline processor (will fail)
-    try:
-        offline_payment_service.setup_recurring(customer_data_with_email, payment_data)
-
-    except Exception as e:
+    for kind, result in report.to_dict()["by_kind"].items():
         print(
-            f"Recurring payment setup failed and PaymentService raised an exception {e}"
+            f"  {kind:10}{result['completed']:8} done  {result['errors']:6} errors"
+            f"   p50 {result['p50_ns'] / 1e6:8.2f} ms"
+            f"   p99 {result['p99_ns'] / 1e6:8.2f} ms"
+            f"   p99.9 {result['p999_ns'] / 1e6:8.2f} ms"
         )
-
-    try:
-        error_payment_data = PaymentData(amount=100, source="tok_radarBlock")
-        payment_service_email.process_transaction(
-            customer_data_with_email, error_payment_data
+    for stage, result in stages.items():
+        print(
+            f"  {stage:18}p50 {result['p50_ns'] / 1e3:9.1f} us"
+            f"   p99 {result['p99_ns'] / 1e3:9.1f} us"
         )
-    except Exception as e:
-        print(f"Payment failed and PaymentService raised an exception: {e}")
-
-    # Set up recurrence
-    recurring_payment_data = PaymentData(amount=100, source="pm_card_visa")
-    payment_service_email.setup_recurring(
-        customer_data_with_email, recurring_payment_data
-    )
-
-    # implementation of Strategy pattern
-    print(
-        "-----------------------------------------------------------------------------"
-    )
-    print(
-        "-----------------------------Using Strategy pattern--------------------------"
-    )
-    print(
-        "-----------------------------------------------------------------------------"
-    )
-    customer_data = get_customer_data()
-    dynamic_notifier = get_notifier_implementation(customer_data)
-
-    payment_service = PaymentService(
-        payment_processor=stripe_processor,
-        notifier=dynamic_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-        refund_processor=stripe_processor,
-        recurring_processor=stripe_processor,
-    )
-    print("Processing transaction with dynamic notifier")
-    payment_service.process_transaction(customer_data, payment_data)
-
-    # implementation of Factory pattern
-    print(
-        "-----------------------------------------------------------------------------"
-    )
-    print(
-        "-----------------------------Using Factory pattern---------------------------"
-    )
-    print(
-        "-----------------------------------------------------------------------------"
-    )
-    print("Processing transaction with factory pattern using Stripe processor")
-    print("payment_service", payment_service)
-    payment_data = PaymentData(amount=100, source="tok_visa", currency="USD")
-    payment_service = PaymentService.create_with_payment_processor(
-        payment_data,
-        notifier=dynamic_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-    )
 
-    payment_service.process_transaction(customer_data, payment_data)
-
-    payment_data = PaymentData(
-        amount=100, source="tok_visa", currency="USD", type=PaymentType.OFFLINE
-    )
-    payment_service = PaymentService.create_with_payment_processor(
-        payment_data,
-        notifier=dynamic_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-    )
-    print("Processing transaction with factory pattern using Offline processor")
-    print("payment_service", payment_service)
-    payment_service.process_transaction(customer_data, payment_data)
-
-    payment_data = PaymentData(amount=100, source="tok_visa", currency="CAD")
-    payment_service = PaymentService.create_with_payment_processor(
-        payment_data,
-        notifier=dynamic_notifier,
-        customer_validator=customer_validator,
-        payment_validator=payment_validator,
-        logger=logger,
-    )
-    print("Processing transaction with factory pattern using Local processor")
-    print("payment_service", payment_service)
-    payment_service.process_transaction(customer_data, payment_data)
 
-    # Builder Pattern
-    print(
-        "-----------------------------------------------------------------------------"
-    )
-    print("-----------------------------Using Build pattern---------------------------")
-    print(
-        "-----------------------------------------------------------------------------"
-    )
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    if not args.real_processors:
+        _register_stub_processors(args)
+    mix = TrafficMix(
+        currencies=_currencies(args.currencies),
+        offline_ratio=args.offline_ratio,
+        phone_ratio=args.phone_ratio,
+        refund_ratio=args.refund_ratio,
+        recurring_ratio=args.recurring_ratio,
+        median_amount=args.median_amount,
+        customers=args.customers,
+    )
+    instrumentation = HistogramInstrumentation()
+    with tempfile.TemporaryDirectory() as directory:
+        pool = PaymentServicePool(
+            logger=TransactionLogger(os.path.join(directory, "transactions.log")),
+            instrumentation=instrumentation,
+            notifier_factory=(
+                None
+                if args.real_processors
+                else lambda kind: StubNotifier(args.notifier_latency)
+            ),
+        ).prewarm()
+        generator = LoadGenerator(
+            pool, TrafficGenerator(mix, args.seed), args.concurrency
+        )
+        report = generator.run(args.duration, args.rate, args.operations)
+    stages = {
+        stage: snapshot.to_dict()
+        for stage, snapshot in instrumentation.snapshot().items()
+    }
+    _print(report, stages)
+    return {**report.to_dict(), "stages": stages, "parameters": vars(args)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--operations", type=int, help="Stop after this many operations"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="Operations per second; open-loop when given"
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--currencies",
+        nargs="+",
+        default=["USD=0.6", "EUR=0.3", "GBP=0.1"],
+        help="Currencies with their weights, as CUR=WEIGHT",
+    )
+    parser.add_argument("--offline-ratio", type=float, default=0.1)
+    parser.add_argument("--phone-ratio", type=float, default=0.3)
+    parser.add_argument("--refund-ratio", type=float, default=0.05)
+    parser.add_argument("--recurring-ratio", type=float, default=0.02)
+    parser.add_argument("--median-amount", type=int, default=3_000)
+    parser.add_argument("--customers", type=int, default=1_000)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--processor-latency", type=float, default=0.0)
+    parser.add_argument("--notifier-latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--real-processors",
+        action="store_true",
+        help="Use the registered processors and notifiers, e.g. Stripe's sandbox",
+    )
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.real_processors:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    results = run(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
 
-    service = (
-        PaymentServiceBuilder()
-        .set_logger()
-        .set_payment_validator()
-        .set_customer_validator()
-        .set_payment_processor(payment_data)
-        .set_notifier(customer_data)
-        .build()
-    )
 
-    print("Processing transaction with build pattern")
-    payment_service.process_transaction(customer_data, payment_data)
+if __name__ == "__main__":
+    main()
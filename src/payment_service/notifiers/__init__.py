@@ -1,5 +1,43 @@
+from src.payment_service.notifiers.async_adapter import (
+    AsyncNotifierAdapter,
+    as_async_notifier,
+)
 from src.payment_service.notifiers.email import EmailNotifier
-from src.payment_service.notifiers.notifier import NotifierProtocol
-from src.payment_service.notifiers.sms import SMSNotifier
+from src.payment_service.notifiers.notifier import (
+    AsyncNotifierProtocol,
+    Confirmation,
+    NotifierProtocol,
+)
+from src.payment_service.notifiers.outbox import NotificationOutbox, OutboxStats
+from src.payment_service.notifiers.smtp import (
+    EmailBackendProtocol,
+    Envelope,
+    SMTPEmailBackend,
+)
+from src.payment_service.notifiers.sms import SMSGatewayClientProtocol, SMSNotifier
+from src.payment_service.notifiers.sms_batch import BatchingSMSNotifier
+from src.payment_service.notifiers.templates import (
+    MessageTemplate,
+    ReceiptTemplate,
+    TemplateCatalog,
+)
 
-__all__ = ["NotifierProtocol", "EmailNotifier", "SMSNotifier"]
+__all__ = [
+    "NotifierProtocol",
+    "AsyncNotifierProtocol",
+    "AsyncNotifierAdapter",
+    "as_async_notifier",
+    "EmailNotifier",
+    "SMSNotifier",
+    "EmailBackendProtocol",
+    "Envelope",
+    "SMTPEmailBackend",
+    "NotificationOutbox",
+    "OutboxStats",
+    "SMSGatewayClientProtocol",
+    "BatchingSMSNotifier",
+    "Confirmation",
+    "MessageTemplate",
+    "ReceiptTemplate",
+    "TemplateCatalog",
+]
@@ -0,0 +1,37 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from .notifier import AsyncNotifierProtocol, NotifierProtocol
+
+
+@dataclass
+class AsyncNotifierAdapter(AsyncNotifierProtocol):
+    """
+    Exposes a sync notifier through `AsyncNotifierProtocol`.
+    """
+
+    notifier: NotifierProtocol
+    blocking: bool = True
+
+    async def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
+        args = (customer_data, payment_data, payment_response)
+        if self.blocking:
+            # Imported here so sync-only workers never load asyncio; by the time
+            # this runs, the event loop has imported it already.
+            import asyncio
+
+            return await asyncio.to_thread(self.notifier.send_confirmation, *args)
+        return self.notifier.send_confirmation(*args)
+
+
+def as_async_notifier(notifier: Any, blocking: bool = True) -> Any:
+    if inspect.iscoroutinefunction(getattr(notifier, "send_confirmation", None)):
+        return notifier
+    return AsyncNotifierAdapter(notifier, blocking=blocking)
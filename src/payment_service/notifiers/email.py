@@ -1,17 +1,64 @@
-from src.payment_service.commons import CustomerData
-from .notifier import NotifierProtocol
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
 
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from .notifier import Confirmation, NotifierProtocol
+from .smtp import EmailBackendProtocol, Envelope
+from .templates import TemplateCatalog
 
-class EmailNotifier(NotifierProtocol):
-    def send_confirmation(self, customer_data: CustomerData):
-        from email.mime.text import MIMEText
 
-        if not customer_data.contact_info.email:
-            raise ValueError("Email address is requiered to send an email")
+@dataclass
+class EmailNotifier(NotifierProtocol):
+    backend: Optional[EmailBackendProtocol] = None
+    sender: str = "no-reply@example.com"
+    templates: TemplateCatalog = field(default_factory=TemplateCatalog)
+    locale: str = "en"
 
-        msg = MIMEText("Thank you for your payment.")
-        msg["Subject"] = "Payment Confirmation"
-        msg["From"] = "no-reply@example.com"
-        msg["To"] = customer_data.contact_info.email
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
+        envelope = self._build_envelope(
+            Confirmation(customer_data, payment_data, payment_response)
+        )
+        if self.backend:
+            error = self.backend.send_many([envelope])[0]
+            if error:
+                raise error
 
         print("Email sent to", customer_data.contact_info.email)
+
+    def send_confirmations(
+            self, confirmations: Sequence[Confirmation]
+    ) -> list[Optional[Exception]]:
+        """
+        Sends every confirmation, as a single batch when a backend is
+        configured.
+        """
+        envelopes = [
+            self._build_envelope(confirmation) for confirmation in confirmations
+        ]
+        if not self.backend:
+            for confirmation in confirmations:
+                print("Email sent to", confirmation.customer_data.contact_info.email)
+            return [None] * len(envelopes)
+        return self.backend.send_many(envelopes)
+
+    def _build_envelope(self, confirmation: Confirmation) -> Envelope:
+        email = confirmation.customer_data.contact_info.email
+        if not email:
+            raise ValueError("Email address is requiered to send an email")
+
+        return Envelope(
+            sender=self.sender,
+            recipients=[email],
+            data=self.templates.render_email(
+                self.locale,
+                self.sender,
+                confirmation.customer_data,
+                confirmation.payment_data,
+                confirmation.payment_response,
+            ),
+        )
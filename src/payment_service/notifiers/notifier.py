@@ -1,6 +1,18 @@
-from typing import Protocol
+from dataclasses import dataclass
+from typing import Optional, Protocol
 
-from src.payment_service.commons import CustomerData
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+@dataclass
+class Confirmation:
+    """
+    One confirmation to send, for notifiers that deliver in batches.
+    """
+
+    customer_data: CustomerData
+    payment_data: Optional[PaymentData] = None
+    payment_response: Optional[PaymentResponse] = None
 
 
 class NotifierProtocol(Protocol):
@@ -9,7 +21,26 @@ class NotifierProtocol(Protocol):
 
     This protocol defines the interface for notifiers. Implementations
     should provide a method `send_confirmation` that sends a confirmation
-    to the customer.
+    to the customer. The payment details are optional and used to render a
+    receipt when given.
+    """
+
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ): ...
+
+
+class AsyncNotifierProtocol(Protocol):
+    """
+    Asyncio counterpart of `NotifierProtocol`.
     """
 
-    def send_confirmation(self, customer_data: CustomerData): ...
+    async def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ): ...
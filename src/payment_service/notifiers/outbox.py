@@ -0,0 +1,276 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from .email import EmailNotifier
+from .notifier import Confirmation, NotifierProtocol
+from .sms import SMSNotifier
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    leased_until REAL,
+    dead INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class OutboxStats:
+    enqueued: int
+    delivered: int
+    failed_attempts: int
+    dead: int
+    backlog: int
+    throughput: float
+
+
+@dataclass
+class NotificationOutbox(NotifierProtocol):
+    """
+    Notifier that persists confirmation jobs and delivers them in the background.
+
+    `send_confirmation` only stores the job in a SQLite outbox and returns.
+    `workers` threads claim due jobs in batches of `batch_size`, deliver them
+    through `sms_notifier` or `email_notifier` and delete them once sent.
+    Failed jobs are retried with exponential backoff up to `max_attempts`
+    and then kept as dead letters. A claimed job that is never acknowledged
+    (e.g. the process died) becomes due again after `lease_timeout` seconds,
+    so delivery is at least once.
+    """
+
+    path: str = "outbox.db"
+    sms_notifier: NotifierProtocol = field(
+        default_factory=lambda: SMSNotifier("YourSMSService")
+    )
+    email_notifier: NotifierProtocol = field(default_factory=EmailNotifier)
+    workers: int = 2
+    batch_size: int = 50
+    max_attempts: int = 5
+    retry_delay: float = 1.0
+    lease_timeout: float = 60.0
+    poll_interval: float = 0.5
+
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    _wakeup: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False
+    )
+    _stopped: threading.Event = field(
+        default_factory=threading.Event, init=False, repr=False
+    )
+    _threads: list[threading.Thread] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _started_at: float = field(default=0.0, init=False, repr=False)
+    _enqueued: int = field(default=0, init=False, repr=False)
+    _delivered: int = field(default=0, init=False, repr=False)
+    _failed_attempts: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self._connection = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._started_at = time.monotonic()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"notification-outbox-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        atexit.register(self.close)
+
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
+        channel = "sms" if customer_data.contact_info.phone else "email"
+        payload = json.dumps(
+            [
+                model.model_dump(mode="json") if model else None
+                for model in (customer_data, payment_data, payment_response)
+            ]
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO notification_jobs (channel, payload, available_at, "
+                "created_at) VALUES (?, ?, ?, ?)",
+                (channel, payload, time.time(), time.time()),
+            )
+            self._enqueued += 1
+        self._wakeup.set()
+
+    def stats(self) -> OutboxStats:
+        with self._lock:
+            backlog, dead = self._connection.execute(
+                "SELECT COALESCE(SUM(dead = 0), 0), COALESCE(SUM(dead), 0) "
+                "FROM notification_jobs"
+            ).fetchone()
+            elapsed = time.monotonic() - self._started_at
+            return OutboxStats(
+                enqueued=self._enqueued,
+                delivered=self._delivered,
+                failed_attempts=self._failed_attempts,
+                dead=dead,
+                backlog=backlog,
+                throughput=self._delivered / elapsed if elapsed else 0.0,
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops the workers. Undelivered jobs stay in the outbox for the next run.
+        """
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._lock:
+            self._connection.close()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                delivering = self._work()
+            except Exception as e:
+                # Keep the worker alive; the claimed jobs become due again
+                # once their lease runs out.
+                print("Notification outbox worker failed:", repr(e))
+                delivering = False
+            if not delivering:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _work(self) -> bool:
+        """
+        Claims and delivers one batch of due jobs; False if there were none.
+        """
+        jobs = self._claim()
+        if not jobs:
+            return False
+        confirmations = []
+        undecodable = []
+        for job_id, channel, payload in jobs:
+            try:
+                confirmations.append((job_id, channel, self._decode(payload)))
+            except Exception as e:
+                undecodable.append((job_id, e))
+        if undecodable:
+            self._acknowledge([], undecodable)
+        for channel in ("sms", "email"):
+            batch = [
+                (job_id, confirmation)
+                for job_id, job_channel, confirmation in confirmations
+                if job_channel == channel
+            ]
+            if batch:
+                self._deliver(channel, batch)
+        return True
+
+    def _claim(self) -> list[tuple[int, str, str]]:
+        now = time.time()
+        with self._lock:
+            if self._stopped.is_set():
+                return []
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, channel, payload FROM notification_jobs "
+                    "WHERE dead = 0 AND available_at <= ? "
+                    "AND (leased_until IS NULL OR leased_until < ?) "
+                    "ORDER BY id LIMIT ?",
+                    (now, now, self.batch_size),
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE notification_jobs SET leased_until = ? WHERE id = ?",
+                    [(now + self.lease_timeout, row[0]) for row in rows],
+                )
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            else:
+                self._connection.execute("COMMIT")
+        return rows
+
+    @staticmethod
+    def _decode(payload: str) -> Confirmation:
+        customer, payment, response = json.loads(payload)
+        return Confirmation(
+            CustomerData.model_validate(customer),
+            PaymentData.model_validate(payment) if payment else None,
+            PaymentResponse.model_validate(response) if response else None,
+        )
+
+    def _deliver(self, channel: str, batch: list[tuple[int, Confirmation]]):
+        notifier = self.sms_notifier if channel == "sms" else self.email_notifier
+        confirmations = [confirmation for _, confirmation in batch]
+        if hasattr(notifier, "send_confirmations"):
+            try:
+                errors = notifier.send_confirmations(confirmations)
+            except Exception as e:
+                errors = [e] * len(confirmations)
+        else:
+            errors = []
+            for confirmation in confirmations:
+                try:
+                    notifier.send_confirmation(
+                        confirmation.customer_data,
+                        confirmation.payment_data,
+                        confirmation.payment_response,
+                    )
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+        if len(errors) != len(confirmations):
+            errors = [
+                ValueError(
+                    f"Notifier returned {len(errors)} results "
+                    f"for {len(confirmations)} confirmations"
+                )
+            ] * len(confirmations)
+
+        delivered = [job_id for (job_id, _), error in zip(batch, errors) if not error]
+        failed = [(job_id, error) for (job_id, _), error in zip(batch, errors) if error]
+        self._acknowledge(delivered, failed)
+
+    def _acknowledge(
+            self, delivered: list[int], failed: list[tuple[int, Exception]]
+    ):
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM notification_jobs WHERE id = ?",
+                [(job_id,) for job_id in delivered],
+            )
+            # Jobs deleted meanwhile (e.g. delivered by another worker after
+            # the lease ran out) simply match no row.
+            self._connection.executemany(
+                "UPDATE notification_jobs SET attempts = attempts + 1, "
+                "available_at = ? + ? * (1 << attempts), leased_until = NULL, "
+                "dead = attempts + 1 >= ?, last_error = ? WHERE id = ?",
+                [
+                    (now, self.retry_delay, self.max_attempts, str(error), job_id)
+                    for job_id, error in failed
+                ],
+            )
+            self._delivered += len(delivered)
+            self._failed_attempts += len(failed)
@@ -1,18 +1,46 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional, Protocol, Sequence
 
-from src.payment_service.commons import CustomerData
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
 from .notifier import NotifierProtocol
+from .templates import TemplateCatalog
+
+
+class SMSGatewayClientProtocol(Protocol):
+    """
+    Protocol for SMS provider clients.
+
+    `send_bulk` submits all `(phone_number, text)` pairs to `gateway` in one
+    request and returns, per message, None on success or the error.
+    """
+
+    def send_bulk(
+            self, gateway: str, messages: Sequence[tuple[str, str]]
+    ) -> list[Optional[Exception]]: ...
 
 
 @dataclass
 class SMSNotifier(NotifierProtocol):
     gateway: str
+    client: Optional[SMSGatewayClientProtocol] = None
+    templates: TemplateCatalog = field(default_factory=TemplateCatalog)
+    locale: str = "en"
 
-    def send_confirmation(self, customer_data: CustomerData):
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
         phone_number = customer_data.contact_info.phone
         if not phone_number:
             print("No phone number provided")
             return
-        print(
-            f"SMS sent to {phone_number} via {self.gateway}: Thank you for your payment."
+        text = self.templates.render_sms(
+            self.locale, customer_data, payment_data, payment_response
         )
+        if self.client:
+            error = self.client.send_bulk(self.gateway, [(phone_number, text)])[0]
+            if error:
+                raise error
+        print(f"SMS sent to {phone_number} via {self.gateway}: {text}")
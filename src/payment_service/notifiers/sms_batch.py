@@ -0,0 +1,166 @@
+import atexit
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from .notifier import Confirmation, NotifierProtocol
+from .sms import SMSGatewayClientProtocol
+from .templates import TemplateCatalog
+
+
+@dataclass
+class BatchingSMSNotifier(NotifierProtocol):
+    """
+    SMS notifier that coalesces messages per gateway into bulk submissions.
+
+    Messages are held for at most `max_wait` seconds or until `max_batch`
+    are pending for a gateway, then submitted in a single `send_bulk` call.
+    Up to `max_concurrent_requests` bulk requests are in flight at once.
+    `send_confirmation` blocks until its own message has been submitted and
+    raises its individual error, if any.
+    """
+
+    client: SMSGatewayClientProtocol
+    gateway: str = "YourSMSService"
+    max_batch: int = 100
+    max_wait: float = 0.05
+    max_concurrent_requests: int = 4
+    templates: TemplateCatalog = field(default_factory=TemplateCatalog)
+    locale: str = "en"
+
+    _pending: dict[str, list[tuple[str, str, Future]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _deadlines: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False
+    )
+    _closed: bool = field(default=False, init=False, repr=False)
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+    _thread: threading.Thread = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_requests, thread_name_prefix="sms-bulk"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="sms-batcher", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def send_confirmation(
+            self,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ):
+        future = self.submit(
+            Confirmation(customer_data, payment_data, payment_response)
+        )
+        if future:
+            future.result()
+
+    def send_confirmations(
+            self, confirmations: Sequence[Confirmation]
+    ) -> list[Optional[Exception]]:
+        futures = [self.submit(confirmation) for confirmation in confirmations]
+        return [future.exception() if future else None for future in futures]
+
+    def submit(
+            self, confirmation: Confirmation, gateway: Optional[str] = None
+    ) -> Optional[Future]:
+        """
+        Queues the confirmation and returns a future resolved once submitted.
+        """
+        phone_number = confirmation.customer_data.contact_info.phone
+        if not phone_number:
+            print("No phone number provided")
+            return None
+        text = self.templates.render_sms(
+            self.locale,
+            confirmation.customer_data,
+            confirmation.payment_data,
+            confirmation.payment_response,
+        )
+        gateway = gateway or self.gateway
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise ValueError("notifier is closed")
+            batch = self._pending.setdefault(gateway, [])
+            if not batch:
+                self._deadlines[gateway] = time.monotonic() + self.max_wait
+            batch.append((phone_number, text, future))
+            if len(batch) >= self.max_batch:
+                self._deadlines[gateway] = 0.0
+            self._condition.notify()
+        return future
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stops accepting messages and waits for the pending ones to be submitted.
+        """
+        with self._condition:
+            self._closed = True
+            for gateway in self._deadlines:
+                self._deadlines[gateway] = 0.0
+            self._condition.notify()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    due = [
+                        gateway
+                        for gateway, deadline in self._deadlines.items()
+                        if deadline <= now
+                    ]
+                    if due or (self._closed and not self._pending):
+                        break
+                    timeout = (
+                        min(self._deadlines.values()) - now if self._deadlines else None
+                    )
+                    self._condition.wait(timeout)
+                if not due:
+                    self._executor.shutdown()
+                    return
+                batches = []
+                for gateway in due:
+                    del self._deadlines[gateway]
+                    batch = self._pending.pop(gateway)
+                    # A full batch may have grown past max_batch meanwhile.
+                    for start in range(0, len(batch), self.max_batch):
+                        batches.append((gateway, batch[start:start + self.max_batch]))
+            for gateway, batch in batches:
+                try:
+                    self._executor.submit(self._submit, gateway, batch)
+                except RuntimeError:
+                    # The interpreter is shutting down (close() runs at exit).
+                    self._submit(gateway, batch)
+
+    def _submit(self, gateway: str, batch: list[tuple[str, str, Future]]):
+        messages = [(phone, text) for phone, text, _ in batch]
+        try:
+            errors = list(self.client.send_bulk(gateway, messages))
+        except Exception as e:
+            errors = [e] * len(batch)
+        if len(errors) < len(batch):
+            # Never leave a caller waiting on a message the gateway skipped.
+            missing = ValueError(
+                f"{gateway} returned {len(errors)} results for {len(batch)} messages"
+            )
+            errors += [missing] * (len(batch) - len(errors))
+        for (phone, text, future), error in zip(batch, errors):
+            if error:
+                future.set_exception(error)
+            else:
+                print(f"SMS sent to {phone} via {gateway}: {text}")
+                future.set_result(None)
+
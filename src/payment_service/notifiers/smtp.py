@@ -0,0 +1,174 @@
+import smtplib
+import threading
+from dataclasses import dataclass
+from queue import Empty, LifoQueue
+from typing import Optional, Protocol, Sequence
+
+
+@dataclass
+class Envelope:
+    sender: str
+    recipients: list[str]
+    data: bytes
+
+
+class EmailBackendProtocol(Protocol):
+    """
+    Protocol for delivering already rendered e-mails.
+
+    `send_many` returns one entry per envelope: None when it was accepted, or
+    the exception that prevented its delivery.
+    """
+
+    def send_many(
+            self, envelopes: Sequence[Envelope]
+    ) -> list[Optional[Exception]]: ...
+
+
+class SMTPEmailBackend(EmailBackendProtocol):
+    """
+    Delivers e-mail over a pool of persistent SMTP sessions.
+
+    Up to `pool_size` sessions are opened lazily and reused across calls, and
+    `send_many` sends a whole batch over a single session. A session dropped
+    by the server is reopened transparently and the message retried once.
+    Sessions are recycled after `max_messages_per_session` messages since
+    many servers cap that number. Failing to open a session is reported in
+    the per-envelope results like any other delivery error: once a connect
+    fails, the rest of the batch gets that error without further attempts.
+    """
+
+    def __init__(
+            self,
+            host: str = "localhost",
+            port: int = 25,
+            pool_size: int = 4,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            starttls: bool = False,
+            timeout: float = 10.0,
+            max_messages_per_session: int = 1000,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_messages_per_session = max_messages_per_session
+        self._idle: LifoQueue[tuple[smtplib.SMTP, int]] = LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def send(self, envelope: Envelope):
+        error = self.send_many([envelope])[0]
+        if error:
+            raise error
+
+    def send_many(self, envelopes: Sequence[Envelope]) -> list[Optional[Exception]]:
+        results: list[Optional[Exception]] = []
+        connect_error: Optional[Exception] = None
+        with self._slots:
+            connection, sent = self._acquire()
+            try:
+                for envelope in envelopes:
+                    if connect_error:
+                        results.append(connect_error)
+                        continue
+                    if (
+                            connection is not None
+                            and sent >= self.max_messages_per_session
+                    ):
+                        self._discard(connection)
+                        connection = None
+                    if connection is None:
+                        try:
+                            connection, sent = self._connect(), 0
+                        except OSError as e:
+                            connect_error = e
+                            results.append(e)
+                            continue
+                    connection, sent, error = self._send_one(
+                        connection, sent, envelope
+                    )
+                    results.append(error)
+            except BaseException:
+                if connection is not None:
+                    self._discard(connection)
+                raise
+            if connection is not None:
+                self._idle.put((connection, sent))
+        return results
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except Empty:
+                return
+            self._discard(connection)
+
+    def _send_one(
+            self, connection: smtplib.SMTP, sent: int, envelope: Envelope
+    ) -> tuple[Optional[smtplib.SMTP], int, Optional[Exception]]:
+        """
+        Returns the session to continue with (None if there is no usable
+        one), its message count and the envelope's error, if any.
+        """
+        alive, error = self._deliver(connection, envelope)
+        if alive:
+            return connection, sent + 1, error
+        self._discard(connection)
+        if not isinstance(error, smtplib.SMTPServerDisconnected):
+            return None, 0, error
+        try:
+            connection = self._connect()
+        except OSError as e:
+            return None, 0, e
+        alive, error = self._deliver(connection, envelope)
+        if alive:
+            return connection, 1, error
+        self._discard(connection)
+        return None, 0, error
+
+    @staticmethod
+    def _deliver(
+            connection: smtplib.SMTP, envelope: Envelope
+    ) -> tuple[bool, Optional[Exception]]:
+        """
+        Sends the envelope; returns whether the session is still usable and
+        the error, if any. `SMTPException` is a subclass of `OSError`.
+        """
+        try:
+            connection.sendmail(envelope.sender, envelope.recipients, envelope.data)
+        except smtplib.SMTPServerDisconnected as e:
+            return False, e
+        except smtplib.SMTPException as e:
+            return True, e
+        except OSError as e:
+            return False, e
+        return True, None
+
+    def _acquire(self) -> tuple[Optional[smtplib.SMTP], int]:
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return None, 0
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password or "")
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _discard(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
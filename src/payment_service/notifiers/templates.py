@@ -0,0 +1,217 @@
+import base64
+from dataclasses import dataclass, field
+from email.header import Header
+from string import Formatter
+from typing import Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+
+
+class MessageTemplate:
+    """
+    A `str.format`-style template parsed once into literal and field
+    segments, so rendering is a single join over precomputed parts.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments: list[tuple[str, Optional[str]]] = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(source):
+            if format_spec or conversion:
+                raise ValueError(f"Unsupported placeholder in template: {source!r}")
+            self._segments.append((literal, field_name))
+        self.fields = frozenset(name for _, name in self._segments if name)
+
+    def render(self, fields: dict[str, str]) -> str:
+        parts = []
+        for literal, field_name in self._segments:
+            parts.append(literal)
+            if field_name:
+                parts.append(fields[field_name])
+        return "".join(parts)
+
+
+@dataclass
+class ReceiptTemplate:
+    """
+    Confirmation texts for one locale. The `plain_` variants are used when a
+    notifier is called without payment details.
+    """
+
+    subject: MessageTemplate
+    body: MessageTemplate
+    sms: MessageTemplate
+    plain_body: MessageTemplate
+    plain_sms: MessageTemplate
+
+    @classmethod
+    def compile(cls, **sources: str) -> "ReceiptTemplate":
+        return cls(**{name: MessageTemplate(text) for name, text in sources.items()})
+
+
+DEFAULT_TEMPLATES = {
+    "en": ReceiptTemplate.compile(
+        subject="Payment Confirmation",
+        body=(
+            "Hi {name},\n\n"
+            "Thank you for your payment of {amount} {currency}.\n"
+            "Transaction ID: {transaction_id}\n"
+        ),
+        sms="Thank you for your payment of {amount} {currency}. Ref {transaction_id}",
+        plain_body="Thank you for your payment.",
+        plain_sms="Thank you for your payment.",
+    ),
+    "es": ReceiptTemplate.compile(
+        subject="Confirmación de pago",
+        body=(
+            "Hola {name},\n\n"
+            "Gracias por tu pago de {amount} {currency}.\n"
+            "ID de transacción: {transaction_id}\n"
+        ),
+        sms="Gracias por tu pago de {amount} {currency}. Ref {transaction_id}",
+        plain_body="Gracias por tu pago.",
+        plain_sms="Gracias por tu pago.",
+    ),
+}
+
+
+# ISO 4217 currencies whose minor unit is not 1/100 of the major unit.
+MINOR_UNIT_EXPONENTS = {
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0,
+    "KRW": 0, "PYG": 0, "RWF": 0, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0,
+    "XOF": 0, "XPF": 0,
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+}
+
+
+def format_amount(amount: int, currency: str = "USD") -> str:
+    """
+    Amounts are kept in minor units, as Stripe expects them: cents for USD,
+    yen for JPY, fils for KWD.
+    """
+    exponent = MINOR_UNIT_EXPONENTS.get(currency.upper(), 2)
+    if not exponent:
+        return str(amount)
+    major, minor = divmod(abs(amount), 10**exponent)
+    sign = "-" if amount < 0 else ""
+    return f"{sign}{major}.{minor:0{exponent}d}"
+
+
+def _header_value(value: str) -> str:
+    """
+    Rejects values that would end the header line and start new headers.
+    """
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"Line break in e-mail header value: {value!r}")
+    return value
+
+
+@dataclass
+class TemplateCatalog:
+    """
+    Localized receipt templates, compiled once, with cached MIME skeletons.
+
+    The headers that only depend on locale and sender are rendered once per
+    pair and reused, so building an e-mail only fills in the recipient,
+    the subject and the per-customer body.
+    """
+
+    templates: dict[str, ReceiptTemplate] = field(
+        default_factory=lambda: dict(DEFAULT_TEMPLATES)
+    )
+    default_locale: str = "en"
+
+    _skeletons: dict[tuple[str, str], bytes] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def get(self, locale: str) -> ReceiptTemplate:
+        """
+        Resolves `es-MX` to `es-MX`, then `es`, then the default locale.
+        """
+        template = self.templates.get(locale) or self.templates.get(
+            locale.split("-")[0]
+        )
+        return template or self.templates[self.default_locale]
+
+    def render_sms(
+            self,
+            locale: str,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ) -> str:
+        template = self.get(locale)
+        if payment_data is None:
+            return template.plain_sms.render({})
+        return template.sms.render(
+            self._fields(customer_data, payment_data, payment_response)
+        )
+
+    def render_email(
+            self,
+            locale: str,
+            sender: str,
+            customer_data: CustomerData,
+            payment_data: Optional[PaymentData] = None,
+            payment_response: Optional[PaymentResponse] = None,
+    ) -> bytes:
+        template = self.get(locale)
+        if payment_data is None:
+            fields = {}
+            body = template.plain_body.render(fields)
+        else:
+            fields = self._fields(customer_data, payment_data, payment_response)
+            body = template.body.render(fields)
+        subject = template.subject.render(fields)
+
+        headers = [
+            self._skeleton(locale, sender),
+            b"Subject: ",
+            self._encode_header(subject),
+            b"\r\nTo: ",
+            _header_value(customer_data.contact_info.email).encode(),
+            b"\r\n",
+        ]
+        if body.isascii():
+            headers.append(b"Content-Transfer-Encoding: 7bit\r\n\r\n")
+            payload = body.replace("\n", "\r\n").encode()
+        else:
+            headers.append(b"Content-Transfer-Encoding: base64\r\n\r\n")
+            payload = base64.encodebytes(body.encode()).replace(b"\n", b"\r\n")
+        return b"".join(headers) + payload
+
+    def _skeleton(self, locale: str, sender: str) -> bytes:
+        key = (locale, sender)
+        skeleton = self._skeletons.get(key)
+        if skeleton is None:
+            skeleton = (
+                f'Content-Type: text/plain; charset="utf-8"\r\n'
+                f"MIME-Version: 1.0\r\n"
+                f"From: {_header_value(sender)}\r\n"
+            ).encode()
+            self._skeletons[key] = skeleton
+        return skeleton
+
+    @staticmethod
+    def _encode_header(value: str) -> bytes:
+        if value.isascii():
+            return _header_value(value).encode()
+        return Header(value, "utf-8").encode().encode()
+
+    @staticmethod
+    def _fields(
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: Optional[PaymentResponse],
+    ) -> dict[str, str]:
+        return {
+            "name": customer_data.name,
+            "amount": format_amount(payment_data.amount, payment_data.currency),
+            "currency": payment_data.currency,
+            "transaction_id": (
+                payment_response.transaction_id
+                if payment_response and payment_response.transaction_id
+                else "-"
+            ),
+        }
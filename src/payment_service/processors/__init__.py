@@ -1,15 +1,66 @@
+import importlib
+from typing import TYPE_CHECKING
+
+from src.payment_service.processors.async_adapter import (
+    AsyncProcessorAdapter,
+    as_async_processor,
+)
 from src.payment_service.processors.local_processor import LocalPaymentProcessor
 from src.payment_service.processors.offline_processor import OfflinePaymentProcessor
-from src.payment_service.processors.payment import PaymentProcessorProtocol
-from src.payment_service.processors.recurring import RecurringPaymentProtocol
-from src.payment_service.processors.refunds import RefundPaymentProtocol
-from src.payment_service.processors.stripe_processor import StripePaymentProcessor
+from src.payment_service.processors.payment import (
+    AsyncPaymentProcessorProtocol,
+    PaymentProcessorProtocol,
+)
+from src.payment_service.processors.recurring import (
+    AsyncRecurringPaymentProtocol,
+    RecurringPaymentProtocol,
+)
+from src.payment_service.processors.refunds import (
+    AsyncRefundPaymentProtocol,
+    RefundPaymentProtocol,
+)
+from src.payment_service.processors.resilient import (
+    CircuitBreaker,
+    CircuitState,
+    ResilientPaymentProcessor,
+    RetryPolicy,
+)
+
+if TYPE_CHECKING:
+    from src.payment_service.processors.stripe_processor import (
+        StripePaymentProcessor,
+    )
+
+# Stripe's SDK dominates the package's import time, so its processor is only
+# imported when first accessed; workers using the other processors never
+# load it.
+_LAZY_ATTRIBUTES = {
+    "StripePaymentProcessor": "src.payment_service.processors.stripe_processor",
+}
 
 __all__ = [
     "PaymentProcessorProtocol",
     "RecurringPaymentProtocol",
     "RefundPaymentProtocol",
+    "AsyncPaymentProcessorProtocol",
+    "AsyncRecurringPaymentProtocol",
+    "AsyncRefundPaymentProtocol",
+    "AsyncProcessorAdapter",
+    "as_async_processor",
     "OfflinePaymentProcessor",
     "LocalPaymentProcessor",
     "StripePaymentProcessor",
+    "ResilientPaymentProcessor",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitState",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
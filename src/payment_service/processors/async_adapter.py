@@ -0,0 +1,73 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.processors.payment import (
+    AsyncPaymentProcessorProtocol,
+    PaymentProcessorProtocol,
+)
+from src.payment_service.processors.recurring import AsyncRecurringPaymentProtocol
+from src.payment_service.processors.refunds import AsyncRefundPaymentProtocol
+
+
+@dataclass
+class AsyncProcessorAdapter(
+    AsyncPaymentProcessorProtocol,
+    AsyncRefundPaymentProtocol,
+    AsyncRecurringPaymentProtocol,
+):
+    """
+    Exposes a sync processor through the async processor protocols.
+
+    Blocking processors (network bound, like Stripe) are run in the default
+    executor. Processors that return immediately can set `blocking=False` to be
+    called inline and skip the thread hop.
+    """
+
+    processor: PaymentProcessorProtocol
+    blocking: bool = True
+
+    async def process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        return await self._call(
+            self.processor.process_transaction, customer_data, payment_data
+        )
+
+    async def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse:
+        if not hasattr(self.processor, "refund_payment"):
+            raise ValueError("this processor does not support refunds")
+        return await self._call(
+            self.processor.refund_payment, transaction_id, idempotency_key
+        )
+
+    async def setup_recurring_payment(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        if not hasattr(self.processor, "setup_recurring_payment"):
+            raise ValueError("this processor does not support recurring")
+        return await self._call(
+            self.processor.setup_recurring_payment, customer_data, payment_data
+        )
+
+    async def _call(self, method: Callable[..., PaymentResponse], *args: Any):
+        if self.blocking:
+            # Imported here so sync-only workers never load asyncio; by the time
+            # this runs, the event loop has imported it already.
+            import asyncio
+
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+
+def as_async_processor(processor: Any, blocking: bool = True) -> Any:
+    """
+    Returns `processor` unchanged if it is already async, otherwise wraps it in
+    an `AsyncProcessorAdapter`.
+    """
+    if inspect.iscoroutinefunction(getattr(processor, "process_transaction", None)):
+        return processor
+    return AsyncProcessorAdapter(processor, blocking=blocking)
@@ -1,6 +1,6 @@
 import uuid
 
-from src.payment_service.commons import PaymentResponse
+from src.payment_service.commons import CompactPaymentResponse
 from src.payment_service.processors.payment import PaymentProcessorProtocol
 from src.payment_service.processors.recurring import RecurringPaymentProtocol
 from src.payment_service.processors.refunds import RefundPaymentProtocol
@@ -11,17 +11,17 @@ class LocalPaymentProcessor(
 ):
     def process_transaction(self, customer_data, payment_data):
         print("Processing payment locally", customer_data.name)
-        transaction_id = f"local-transaction-id-{uuid.UUID}"
-        return PaymentResponse(
+        transaction_id = f"local-transaction-id-{uuid.uuid4()}"
+        return CompactPaymentResponse(
             status="success",
             amount=payment_data.amount,
             transaction_id=transaction_id,
             message="Payment successful",
         )
 
-    def refund_payment(self, transaction_id):
+    def refund_payment(self, transaction_id, idempotency_key=None):
         print("Refunding payment locally for transaction id", transaction_id)
-        return PaymentResponse(
+        return CompactPaymentResponse(
             status="success",
             amount=0,
             transaction_id=transaction_id,
@@ -30,7 +30,7 @@ class LocalPaymentProcessor(
 
     def setup_recurring_payment(self, customer_data, payment_data):
         print("Setting up recurring payment locally")
-        return PaymentResponse(
+        return CompactPaymentResponse(
             status="success",
             amount=payment_data.amount,
             transaction_id=None,
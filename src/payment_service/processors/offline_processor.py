@@ -1,13 +1,17 @@
-from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.commons import (
+    CompactPaymentResponse,
+    CustomerData,
+    PaymentData,
+)
 from src.payment_service.processors.payment import PaymentProcessorProtocol
 
 
 class OfflinePaymentProcessor(PaymentProcessorProtocol):
     def process_transaction(
             self, customer_data: CustomerData, payment_data: PaymentData
-    ) -> PaymentResponse:
+    ) -> CompactPaymentResponse:
         print("Processing offline payment for", customer_data.name)
-        return PaymentResponse(
+        return CompactPaymentResponse(
             status="success",
             amount=payment_data.amount,
             transaction_id=None,
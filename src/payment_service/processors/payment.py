@@ -14,3 +14,16 @@ class PaymentProcessorProtocol(Protocol):
     def process_transaction(
             self, customer_data: CustomerData, payment_data: PaymentData
     ) -> PaymentResponse: ...
+
+
+class AsyncPaymentProcessorProtocol(Protocol):
+    """
+    Asyncio counterpart of `PaymentProcessorProtocol`.
+
+    Implementations must not block the event loop while the payment is in
+    flight; sync processors can be adapted with `as_async_processor`.
+    """
+
+    async def process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse: ...
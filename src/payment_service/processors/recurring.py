@@ -7,3 +7,9 @@ class RecurringPaymentProtocol(Protocol):
     def setup_recurring_payment(
             self, customer_data: CustomerData, payment_data: PaymentData
     ) -> PaymentResponse: ...
+
+
+class AsyncRecurringPaymentProtocol(Protocol):
+    async def setup_recurring_payment(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse: ...
@@ -1,7 +1,15 @@
-from typing import Protocol
+from typing import Optional, Protocol
 
 from src.payment_service.commons import PaymentResponse
 
 
 class RefundPaymentProtocol(Protocol):
-    def refund_payment(self, transaction_id: str) -> PaymentResponse: ...
+    def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse: ...
+
+
+class AsyncRefundPaymentProtocol(Protocol):
+    async def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse: ...
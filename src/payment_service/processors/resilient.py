@@ -0,0 +1,193 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from src.payment_service.commons import (
+    CompactPaymentResponse,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+)
+from src.payment_service.idempotency import new_idempotency_key, with_idempotency_key
+from src.payment_service.processors.payment import PaymentProcessorProtocol
+from src.payment_service.processors.recurring import RecurringPaymentProtocol
+from src.payment_service.processors.refunds import RefundPaymentProtocol
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries transient failures with full-jitter exponential backoff.
+
+    `deadline` bounds the whole call, attempts and backoff included: no retry
+    is started if its backoff would end past it. A single attempt is bounded
+    by the wrapped processor's own timeout, e.g.
+    `StripePaymentProcessor(timeout=...)`.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    deadline: float = 10.0
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive transient failures and
+    rejects calls for `reset_timeout` seconds. Then a single trial call is let
+    through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.OPEN and (
+                    time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._state = CircuitState.HALF_OPEN
+                return True
+            # Half open: the trial call is still in flight.
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if (
+                    self._state is CircuitState.HALF_OPEN
+                    or self._failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+
+
+@dataclass
+class ResilientPaymentProcessor(
+    PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol
+):
+    """
+    Wraps any processor with retries, a call deadline and a circuit breaker.
+
+    Only failures marked `retryable` (or `ConnectionError`/`TimeoutError`
+    raised by the processor) are retried and count against the breaker;
+    declines are returned as they are. Charges and refunds without an
+    idempotency key get a fresh one before the first attempt, so the retries
+    of one request share it and can not double charge. Recurring setups span
+    several calls and are never retried, only guarded by the breaker.
+    """
+
+    processor: Any
+    retry_policy: RetryPolicy = field(default_factory=RetryPolicy)
+    circuit_breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+    def process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        return self._call(
+            self.processor.process_transaction,
+            (customer_data, with_idempotency_key(payment_data)),
+            amount=payment_data.amount,
+            max_attempts=self.retry_policy.max_attempts,
+        )
+
+    def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> PaymentResponse:
+        if not hasattr(self.processor, "refund_payment"):
+            raise ValueError("this processor does not support refunds")
+        return self._call(
+            self.processor.refund_payment,
+            (transaction_id, idempotency_key or new_idempotency_key("refund")),
+            amount=0,
+            max_attempts=self.retry_policy.max_attempts,
+        )
+
+    def setup_recurring_payment(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        if not hasattr(self.processor, "setup_recurring_payment"):
+            raise ValueError("this processor does not support recurring")
+        return self._call(
+            self.processor.setup_recurring_payment,
+            (customer_data, payment_data),
+            amount=0,
+            max_attempts=1,
+        )
+
+    def _call(
+            self,
+            method: Callable[..., PaymentResponse],
+            args: tuple[Any, ...],
+            amount: int,
+            max_attempts: int,
+    ) -> PaymentResponse:
+        deadline = time.monotonic() + self.retry_policy.deadline
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                return self._failed(amount, "Circuit open, processor unavailable")
+            try:
+                response = method(*args)
+            except (ConnectionError, TimeoutError) as e:
+                response = self._failed(amount, str(e))
+            except Exception:
+                # Not an availability problem (e.g. bad input); don't leave a
+                # half open circuit waiting for a trial result forever.
+                self.circuit_breaker.record_success()
+                raise
+
+            if response.status != "failed" or not response.retryable:
+                self.circuit_breaker.record_success()
+                return response
+            self.circuit_breaker.record_failure()
+
+            attempt += 1
+            delay = self.retry_policy.backoff(attempt)
+            if attempt >= max_attempts:
+                return response
+            if time.monotonic() + delay >= deadline:
+                return self._failed(
+                    amount, f"Deadline exceeded after {attempt} attempts: "
+                            f"{response.message}"
+                )
+            print(f"Transient failure, retrying in {delay:.2f}s:", response.message)
+            time.sleep(delay)
+
+    @staticmethod
+    def _failed(amount: int, message: str) -> CompactPaymentResponse:
+        return CompactPaymentResponse(
+            status="failed",
+            amount=amount,
+            transaction_id=None,
+            message=message,
+            retryable=True,
+        )
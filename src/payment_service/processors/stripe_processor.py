@@ -1,9 +1,18 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
+import requests
 import stripe
+from requests.adapters import HTTPAdapter
 from stripe.error import StripeError
 
-from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.commons import (
+    CompactPaymentResponse,
+    CustomerData,
+    PaymentData,
+)
+from src.payment_service.processors.cache import CacheStats, TTLCache
 from src.payment_service.processors.payment import PaymentProcessorProtocol
 from src.payment_service.processors.recurring import RecurringPaymentProtocol
 from src.payment_service.processors.refunds import RefundPaymentProtocol
@@ -12,19 +21,51 @@ from src.payment_service.processors.refunds import RefundPaymentProtocol
 class StripePaymentProcessor(
     PaymentProcessorProtocol, RefundPaymentProtocol, RecurringPaymentProtocol
 ):
+    def __init__(
+            self,
+            api_key: Optional[str] = None,
+            max_connections: int = 32,
+            timeout: int = 30,
+            api_base: Optional[str] = None,
+            cache_ttl: float = 300.0,
+            cache_size: int = 10_000,
+    ):
+        """
+        Creates the Stripe client once, with its own keep-alive connection pool.
+
+        The pool is shared by every thread using this processor, so size
+        `max_connections` for the expected concurrency. `api_base` points the
+        client somewhere else than the Stripe API, e.g. a local stub.
+        Customers and their default payment method are cached for `cache_ttl`
+        seconds so repeat recurring setups skip the redundant API calls.
+        """
+        self.customer_cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.payment_method_cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self.price_id = os.getenv("STRIPE_PRICE_ID", "")
+        self.timeout = timeout
+        self.api_base = api_base or stripe.DEFAULT_API_BASE
+        self.session = self._create_session(max_connections)
+        self.client = stripe.StripeClient(
+            api_key or os.getenv("STRIPE_API_KEY", ""),
+            http_client=stripe.RequestsClient(timeout=timeout, session=self.session),
+            base_addresses={"api": api_base} if api_base else {},
+        )
+
     def process_transaction(
             self, customer_data: CustomerData, payment_data: PaymentData
-    ) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
+    ) -> CompactPaymentResponse:
         try:
-            charge = stripe.Charge.create(
-                amount=payment_data.amount,
-                currency="usd",
-                source=payment_data.source,
-                description="Charge for " + customer_data.name,
+            charge = self.client.charges.create(
+                params={
+                    "amount": payment_data.amount,
+                    "currency": "usd",
+                    "source": payment_data.source,
+                    "description": "Charge for " + customer_data.name,
+                },
+                options=self._idempotency_options(payment_data.idempotency_key),
             )
             print("Payment successful")
-            return PaymentResponse(
+            return CompactPaymentResponse(
                 status=charge["status"],
                 amount=charge["amount"],
                 transaction_id=charge["id"],
@@ -32,19 +73,24 @@ class StripePaymentProcessor(
             )
         except StripeError as e:
             print("Payment failed:", e)
-            return PaymentResponse(
+            return CompactPaymentResponse(
                 status="failed",
                 amount=payment_data.amount,
                 transaction_id=None,
                 message=str(e),
+                retryable=self._is_transient(e),
             )
 
-    def refund_payment(self, transaction_id: str) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
+    def refund_payment(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ) -> CompactPaymentResponse:
         try:
-            refund = stripe.Refund.create(charge=transaction_id)
+            refund = self.client.refunds.create(
+                params={"charge": transaction_id},
+                options=self._idempotency_options(idempotency_key),
+            )
             print("Refund successful")
-            return PaymentResponse(
+            return CompactPaymentResponse(
                 status=refund["status"],
                 amount=refund["amount"],
                 transaction_id=refund["id"],
@@ -52,38 +98,44 @@ class StripePaymentProcessor(
             )
         except StripeError as e:
             print("Refund failed:", e)
-            return PaymentResponse(
+            return CompactPaymentResponse(
                 status="failed",
                 amount=0,
                 transaction_id=None,
                 message=str(e),
+                retryable=self._is_transient(e),
             )
 
     def setup_recurring_payment(
             self, customer_data: CustomerData, payment_data: PaymentData
-    ) -> PaymentResponse:
-        stripe.api_key = os.getenv("STRIPE_API_KEY")
-        price_id = os.getenv("STRIPE_PRICE_ID", "")
+    ) -> CompactPaymentResponse:
         try:
             customer = self._get_or_create_customer(customer_data)
 
-            payment_method = self._attach_payment_method(
-                customer.id, payment_data.source
-            )
-
-            self._set_default_payment_method(customer.id, payment_method.id)
+            # The cache holds the source last made the customer's default, so a
+            # hit means the attach/modify calls would be no-ops.
+            cached_source = self.payment_method_cache.get(customer.id)
+            if cached_source != payment_data.source:
+                payment_method = self._attach_payment_method(
+                    customer.id, payment_data.source
+                )
+                self._set_default_payment_method(customer.id, payment_method.id)
+                self.payment_method_cache.put(customer.id, payment_data.source)
 
-            subscription = stripe.Subscription.create(
-                customer=customer.id,
-                items=[
-                    {"price": price_id},
-                ],
-                expand=["latest_invoice.payment_intent"],
+            subscription = self.client.subscriptions.create(
+                params={
+                    "customer": customer.id,
+                    "items": [
+                        {"price": self.price_id},
+                    ],
+                    "expand": ["latest_invoice.payment_intent"],
+                },
+                options=self._idempotency_options(payment_data.idempotency_key),
             )
 
             print("Recurring payment setup successful")
             amount = subscription["items"]["data"][0]["price"]["unit_amount"]
-            return PaymentResponse(
+            return CompactPaymentResponse(
                 status=subscription["status"],
                 amount=amount,
                 transaction_id=subscription["id"],
@@ -91,27 +143,102 @@ class StripePaymentProcessor(
             )
         except StripeError as e:
             print("Recurring payment setup failed:", e)
-            return PaymentResponse(
+            self.invalidate_customer(customer_data)
+            return CompactPaymentResponse(
                 status="failed",
                 amount=0,
                 transaction_id=None,
                 message=str(e),
+                retryable=self._is_transient(e),
             )
 
+    def prewarm(self, connections: int = 1):
+        """
+        Opens up to `connections` keep-alive connections to the API ahead of
+        the first payment, so it does not pay for the TCP and TLS handshakes.
+        Best effort: failures are reported and otherwise ignored.
+        """
+
+        def connect(_):
+            try:
+                self.session.head(self.api_base, timeout=self.timeout).close()
+            except requests.RequestException as e:
+                print("Prewarming Stripe connection failed:", e)
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(connect, range(connections)))
+
+    def invalidate_customer(self, customer_data: CustomerData):
+        """
+        Drops the cached customer and payment method, e.g. after the customer
+        was changed outside of this processor.
+        """
+        customer = self.customer_cache.pop(self._customer_cache_key(customer_data))
+        if customer is not None:
+            self.payment_method_cache.invalidate(customer.id)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return {
+            "customers": self.customer_cache.stats(),
+            "payment_methods": self.payment_method_cache.stats(),
+        }
+
+    @staticmethod
+    def _is_transient(error: StripeError) -> bool:
+        """
+        Rate limits, connection problems and Stripe-side errors may succeed
+        when retried; everything else (declines, invalid requests) will not.
+        """
+        if isinstance(error, (stripe.RateLimitError, stripe.APIConnectionError)):
+            return True
+        return isinstance(error, stripe.APIError) and (error.http_status or 500) >= 500
+
+    @staticmethod
+    def _idempotency_options(idempotency_key: Optional[str]) -> dict:
+        return {"idempotency_key": idempotency_key} if idempotency_key else {}
+
+    @staticmethod
+    def _customer_cache_key(customer_data: CustomerData) -> str:
+        if customer_data.customer_id:
+            return customer_data.customer_id
+        return f"email:{customer_data.contact_info.email}"
+
+    @staticmethod
+    def _create_session(max_connections: int) -> requests.Session:
+        """
+        Builds a requests session whose pool keeps up to `max_connections`
+        connections alive and blocks callers instead of opening extra ones.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_connections, pool_block=True
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def _get_or_create_customer(self, customer_data: CustomerData) -> stripe.Customer:
         """
         Creates a new customer in Stripe or retrieves an existing one.
         """
+        cache_key = self._customer_cache_key(customer_data)
+        customer = self.customer_cache.get(cache_key)
+        if customer is not None:
+            return customer
         if customer_data.customer_id:
-            customer = stripe.Customer.retrieve(customer_data.customer_id)
+            customer = self.client.customers.retrieve(customer_data.customer_id)
             print(f"Customer retrieved: {customer.id}")
         else:
             if not customer_data.contact_info.email:
                 raise ValueError("Email required for subscriptions")
-            customer = stripe.Customer.create(
-                name=customer_data.name, email=customer_data.contact_info.email
+            customer = self.client.customers.create(
+                params={
+                    "name": customer_data.name,
+                    "email": customer_data.contact_info.email,
+                }
             )
             print(f"Customer created: {customer.id}")
+        self.customer_cache.put(cache_key, customer)
         return customer
 
     def _attach_payment_method(
@@ -120,10 +247,10 @@ class StripePaymentProcessor(
         """
         Attaches a payment method to a customer.
         """
-        payment_method = stripe.PaymentMethod.retrieve(payment_source)
-        stripe.PaymentMethod.attach(
+        payment_method = self.client.payment_methods.retrieve(payment_source)
+        self.client.payment_methods.attach(
             payment_method.id,
-            customer=customer_id,
+            params={"customer": customer_id},
         )
         print(f"Payment method {payment_method.id} attached to customer {customer_id}")
         return payment_method
@@ -134,10 +261,12 @@ class StripePaymentProcessor(
         """
         Sets the default payment method for a customer.
         """
-        stripe.Customer.modify(
+        self.client.customers.update(
             customer_id,
-            invoice_settings={
-                "default_payment_method": payment_method_id,
+            params={
+                "invoice_settings": {
+                    "default_payment_method": payment_method_id,
+                },
             },
         )
         print(f"Default payment method set for customer {customer_id}")
@@ -1,18 +1,37 @@
-from dataclasses import dataclass
-from typing import Optional, Self
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Self
 
-from src.payment_service.commons import CustomerData, PaymentData, PaymentResponse
+from src.payment_service.commons import (
+    BatchItemResult,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+    to_model,
+)
 from src.payment_service.factories.payment_processor_factory import (
     PaymentProcessorFactory,
 )
-from src.payment_service.loggers import TransactionLogger
+from src.payment_service.idempotency import IdempotencyStore
+from src.payment_service.instrumentation import (
+    InstrumentationProtocol,
+    NoopInstrumentation,
+    PaymentMetrics,
+)
+from src.payment_service.loggers import TransactionLedger, TransactionLoggerProtocol
 from src.payment_service.notifiers import NotifierProtocol
 from src.payment_service.processors import (
     PaymentProcessorProtocol,
     RecurringPaymentProtocol,
     RefundPaymentProtocol,
 )
-from src.payment_service.validators import CustomerValidator, PaymentDataValidator
+from src.payment_service.validators import (
+    CustomerValidator,
+    PaymentDataValidator,
+    RuleEngine,
+)
 
 
 @dataclass
@@ -21,9 +40,16 @@ class PaymentService:
     notifier: NotifierProtocol
     customer_validator: CustomerValidator
     payment_validator: PaymentDataValidator
-    logger: TransactionLogger
+    logger: TransactionLoggerProtocol
     recurring_processor: Optional[RecurringPaymentProtocol] = None
     refund_processor: Optional[RefundPaymentProtocol] = None
+    ledger: Optional[TransactionLedger] = None
+    idempotency_store: Optional[IdempotencyStore] = None
+    rule_engine: Optional[RuleEngine] = None
+    instrumentation: InstrumentationProtocol = field(
+        default_factory=NoopInstrumentation
+    )
+    metrics: Optional[PaymentMetrics] = None
 
     @classmethod
     def create_with_payment_processor(
@@ -41,31 +67,186 @@ class PaymentService:
     def process_transaction(
             self, customer_data: CustomerData, payment_data: PaymentData
     ) -> PaymentResponse:
-        self.customer_validator.validate(customer_data)
-        self.payment_validator.validate(payment_data)
-        payment_response = self.payment_processor.process_transaction(
-            customer_data, payment_data
-        )
-        self.notifier.send_confirmation(customer_data)
-        self.logger.log_transaction(customer_data, payment_data, payment_response)
+        with self.instrumentation.stage("total"):
+            return to_model(
+                self._process_transaction(customer_data, payment_data)
+            )
+
+    def _process_transaction(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> PaymentResponse:
+        with self.instrumentation.stage("validate_customer"):
+            self.customer_validator.validate(customer_data)
+        with self.instrumentation.stage("validate_payment"):
+            self.payment_validator.validate(payment_data)
+        if self.rule_engine:
+            with self.instrumentation.stage("rules"):
+                self.rule_engine.validate(customer_data, payment_data)
+        # Only a key from the caller marks a resubmission; equal contents alone
+        # may well be a second, legitimate charge.
+        deduplicate = self.idempotency_store and payment_data.idempotency_key
+        if deduplicate:
+            stored_response = self.idempotency_store.begin(payment_data.idempotency_key)
+            if stored_response:
+                return stored_response
+        started = time.perf_counter()
+        try:
+            with self.instrumentation.stage("process"):
+                payment_response = self.payment_processor.process_transaction(
+                    customer_data, payment_data
+                )
+        except Exception:
+            if deduplicate:
+                self.idempotency_store.release(payment_data.idempotency_key)
+            if self.metrics:
+                self.metrics.transaction_failed(self.payment_processor, payment_data)
+            raise
+        if self.metrics:
+            self.metrics.transaction_completed(
+                self.payment_processor,
+                payment_data,
+                payment_response,
+                time.perf_counter() - started,
+            )
+        if deduplicate:
+            self.idempotency_store.complete(
+                payment_data.idempotency_key, payment_response
+            )
+        # Log first: the charge happened even if the notification fails.
+        self._log_transaction(customer_data, payment_data, payment_response)
+        with self.instrumentation.stage("notify"):
+            self.notifier.send_confirmation(
+                customer_data, payment_data, payment_response
+            )
         return payment_response
 
-    def process_refund(self, transaction_id: str):
+    def process_batch(
+            self,
+            transactions: Iterable[tuple[CustomerData, PaymentData]],
+            max_in_flight: int = 8,
+            ordered: bool = True,
+    ) -> Iterator[BatchItemResult]:
+        """
+        Processes many transactions concurrently on a worker pool.
+
+        At most `max_in_flight` transactions are submitted at any time, so the
+        input iterable is consumed lazily and can be arbitrarily large. Results
+        are yielded in input order when `ordered` is true, or as soon as they
+        finish otherwise. A failing item is reported through its
+        `BatchItemResult.error` and does not stop the batch.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        with ThreadPoolExecutor(
+                max_workers=max_in_flight, thread_name_prefix="payment-batch"
+        ) as executor:
+            pending: deque[Future[BatchItemResult]] = deque()
+            for index, (customer_data, payment_data) in enumerate(transactions):
+                if len(pending) >= max_in_flight:
+                    yield from self._drain_batch(pending, ordered)
+                pending.append(
+                    executor.submit(
+                        self._process_batch_item, index, customer_data, payment_data
+                    )
+                )
+            while pending:
+                yield from self._drain_batch(pending, ordered)
+
+    def _drain_batch(
+            self, pending: deque[Future[BatchItemResult]], ordered: bool
+    ) -> Iterator[BatchItemResult]:
+        """
+        Waits for room in the in-flight window and yields what finished.
+        """
+        if ordered:
+            yield pending.popleft().result()
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
+
+    def _process_batch_item(
+            self, index: int, customer_data: CustomerData, payment_data: PaymentData
+    ) -> BatchItemResult:
+        try:
+            response = self.process_transaction(customer_data, payment_data)
+            return BatchItemResult(index, customer_data, payment_data, response=response)
+        except Exception as e:
+            return BatchItemResult(index, customer_data, payment_data, error=str(e))
+
+    def process_refund(
+            self, transaction_id: str, idempotency_key: Optional[str] = None
+    ):
+        """
+        Refunds a charge. Pass the same `idempotency_key` when resubmitting a
+        refund to get the first result back; without one every call is a new
+        refund attempt, so a failed refund can always be retried.
+        """
         if not self.refund_processor:
             raise ValueError("this processor does not support refunds")
 
-        refund_response = self.refund_processor.refund_payment(transaction_id)
-        self.logger.log_refund(transaction_id, refund_response)
-        return refund_response
+        deduplicate = self.idempotency_store and idempotency_key
+        if deduplicate:
+            stored_response = self.idempotency_store.begin(idempotency_key)
+            if stored_response:
+                return to_model(stored_response)
+        try:
+            with self.instrumentation.stage("refund"):
+                refund_response = self._refund(transaction_id, idempotency_key)
+        except Exception:
+            if deduplicate:
+                self.idempotency_store.release(idempotency_key)
+            if self.metrics:
+                self.metrics.refund_failed(self.refund_processor)
+            raise
+        if self.metrics:
+            self.metrics.refund_completed(self.refund_processor, refund_response)
+        if deduplicate:
+            self.idempotency_store.complete(idempotency_key, refund_response)
+        with self.instrumentation.stage("log_refund"):
+            self.logger.log_refund(transaction_id, refund_response)
+            if self.ledger:
+                self.ledger.log_refund(transaction_id, refund_response)
+        return to_model(refund_response)
 
     def setup_recurring(self, customer_data: CustomerData, payment_data: PaymentData):
         if not self.recurring_processor:
             raise ValueError("this processor does not support recurring")
-        recurring_response = self.recurring_processor.setup_recurring_payment(
-            customer_data, payment_data
-        )
-        self.logger.log_transaction(customer_data, payment_data, recurring_response)
-        return recurring_response
+        with self.instrumentation.stage("recurring"):
+            recurring_response = self.recurring_processor.setup_recurring_payment(
+                customer_data, payment_data
+            )
+        self._log_transaction(customer_data, payment_data, recurring_response)
+        return to_model(recurring_response)
+
+    def _refund(
+            self, transaction_id: str, idempotency_key: Optional[str]
+    ) -> PaymentResponse:
+        if self.ledger:
+            self.ledger.reserve_refund(transaction_id)
+        try:
+            return self.refund_processor.refund_payment(
+                transaction_id, idempotency_key
+            )
+        except Exception:
+            if self.ledger:
+                self.ledger.release_refund(transaction_id)
+            raise
+
+    def _log_transaction(
+            self,
+            customer_data: CustomerData,
+            payment_data: PaymentData,
+            payment_response: PaymentResponse,
+    ):
+        with self.instrumentation.stage("log"):
+            self.logger.log_transaction(customer_data, payment_data, payment_response)
+            if self.ledger:
+                self.ledger.log_transaction(
+                    customer_data, payment_data, payment_response
+                )
 
     def set_notifier(self, notifier):
         print("Setting notifier")
@@ -1,4 +1,12 @@
 from src.payment_service.validators.customer_validator import CustomerValidator
 from src.payment_service.validators.payment_validator import PaymentDataValidator
+from src.payment_service.validators.report import ValidationReport
+from src.payment_service.validators.rules import RuleEngine, ValidationRule
 
-__all__ = ["CustomerValidator", "PaymentDataValidator"]
+__all__ = [
+    "CustomerValidator",
+    "PaymentDataValidator",
+    "ValidationReport",
+    "RuleEngine",
+    "ValidationRule",
+]
@@ -1,4 +1,8 @@
+from operator import attrgetter
+from typing import Sequence
+
 from src.payment_service.commons import CustomerData
+from src.payment_service.validators.report import ValidationReport
 
 
 class CustomerValidator:
@@ -12,3 +16,31 @@ class CustomerValidator:
         if not (customer_data.contact_info.email or customer_data.contact_info.phone):
             print("Invalid customer data: missing email and phone")
             raise ValueError("Invalid customer data: missing email and phone")
+
+    def validate_many(self, customers: Sequence[CustomerData]) -> ValidationReport:
+        """
+        Validates a whole batch column by column without raising or printing.
+        """
+        names = list(map(attrgetter("name"), customers))
+        contacts = list(map(attrgetter("contact_info"), customers))
+        return ValidationReport.from_failures(
+            len(names),
+            [
+                (
+                    "Invalid customer data: missing name",
+                    [row for row, name in enumerate(names) if not name],
+                ),
+                (
+                    "Invalid customer data: missing contact info",
+                    [row for row, contact in enumerate(contacts) if not contact],
+                ),
+                (
+                    "Invalid customer data: missing email and phone",
+                    [
+                        row
+                        for row, contact in enumerate(contacts)
+                        if contact and not (contact.email or contact.phone)
+                    ],
+                ),
+            ],
+        )
@@ -1,4 +1,8 @@
-from src.payment_service.commons import PaymentData
+from operator import attrgetter
+from typing import Sequence, Union
+
+from src.payment_service.commons import PaymentBatch, PaymentData
+from src.payment_service.validators.report import ValidationReport
 
 
 class PaymentDataValidator:
@@ -9,3 +13,29 @@ class PaymentDataValidator:
         if payment_data.amount <= 0:
             print("Invalid payment data: amount must be positive")
             raise ValueError("Invalid payment data: amount must be positive")
+
+    def validate_many(
+            self, payments: Union[PaymentBatch, Sequence[PaymentData]]
+    ) -> ValidationReport:
+        """
+        Validates a whole batch column by column without raising or printing.
+        A `PaymentBatch` is read straight from its columns.
+        """
+        if isinstance(payments, PaymentBatch):
+            sources, amounts = payments.sources, payments.amounts
+        else:
+            sources = list(map(attrgetter("source"), payments))
+            amounts = list(map(attrgetter("amount"), payments))
+        return ValidationReport.from_failures(
+            len(sources),
+            [
+                (
+                    "Invalid payment data: missing source",
+                    [row for row, source in enumerate(sources) if not source],
+                ),
+                (
+                    "Invalid payment data: amount must be positive",
+                    [row for row, amount in enumerate(amounts) if amount <= 0],
+                ),
+            ],
+        )
@@ -0,0 +1,47 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ValidationReport:
+    """
+    Result of validating a batch of rows.
+
+    `mask` holds one byte per row (1 when valid) and `errors` maps each
+    invalid row index to its first error message, in the same precedence
+    the single-object `validate` methods use.
+    """
+
+    mask: bytearray
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_failures(
+            cls, size: int, failures: list[tuple[str, list[int]]]
+    ) -> "ValidationReport":
+        """
+        Builds a report from `(message, failing rows)` checks given in
+        precedence order.
+        """
+        mask = bytearray(b"\x01") * size
+        errors: dict[int, str] = {}
+        for message, rows in failures:
+            for row in rows:
+                if row not in errors:
+                    errors[row] = message
+                    mask[row] = 0
+        return cls(mask=mask, errors=errors)
+
+    @property
+    def valid_count(self) -> int:
+        return len(self.mask) - len(self.errors)
+
+    @property
+    def invalid_count(self) -> int:
+        return len(self.errors)
+
+    @property
+    def all_valid(self) -> bool:
+        return not self.errors
+
+    def invalid_rows(self) -> list[int]:
+        return sorted(self.errors)
@@ -0,0 +1,213 @@
+import itertools
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from src.payment_service.commons import CustomerData, PaymentData
+
+
+@dataclass(eq=False)
+class ValidationRule:
+    """
+    A validation rule: `predicate` must return true for the request to pass.
+    `evaluations` and `rejections` count the engine's sampled checks.
+    """
+
+    name: str
+    message: str
+    predicate: Callable[[CustomerData, PaymentData], bool]
+    evaluations: int = 0
+    rejections: int = 0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejections / self.evaluations if self.evaluations else 0.0
+
+
+def _base_rules(enabled: bool) -> list[ValidationRule]:
+    if not enabled:
+        return []
+    return [
+        ValidationRule(
+            "name",
+            "Invalid customer data: missing name",
+            lambda customer, payment: bool(customer.name),
+        ),
+        ValidationRule(
+            "contact",
+            "Invalid customer data: missing email and phone",
+            lambda customer, payment: bool(
+                customer.contact_info
+                and (customer.contact_info.email or customer.contact_info.phone)
+            ),
+        ),
+        ValidationRule(
+            "source",
+            "Invalid payment data: missing source",
+            lambda customer, payment: bool(payment.source),
+        ),
+        ValidationRule(
+            "positive_amount",
+            "Invalid payment data: amount must be positive",
+            lambda customer, payment: payment.amount > 0,
+        ),
+    ]
+
+
+def _amount_ranges(ranges: dict[str, list[int]]) -> list[ValidationRule]:
+    bounds = {currency: tuple(limits) for currency, limits in ranges.items()}
+    default = bounds.pop("*", None)
+
+    def in_range(customer: CustomerData, payment: PaymentData) -> bool:
+        limits = bounds.get(payment.currency, default)
+        return limits is None or limits[0] <= payment.amount <= limits[1]
+
+    return [
+        ValidationRule(
+            "amount_range", "Invalid payment data: amount out of range", in_range
+        )
+    ]
+
+
+def _allowed_sources(prefixes: list[str]) -> list[ValidationRule]:
+    allowed = tuple(prefixes)
+    return [
+        ValidationRule(
+            "allowed_source",
+            "Invalid payment data: source not allowed",
+            lambda customer, payment: payment.source.startswith(allowed),
+        )
+    ]
+
+
+def _pattern(
+        field_name: str, message: str
+) -> Callable[[str], list[ValidationRule]]:
+    def build(pattern: str) -> list[ValidationRule]:
+        match = re.compile(pattern).fullmatch
+
+        def matches(customer: CustomerData, payment: PaymentData) -> bool:
+            value = getattr(customer.contact_info, field_name)
+            return value is None or match(value) is not None
+
+        return [ValidationRule(f"{field_name}_format", message, matches)]
+
+    return build
+
+
+def _customer_limits(limits: dict[str, int]) -> list[ValidationRule]:
+    limits = dict(limits)
+
+    def within_limit(customer: CustomerData, payment: PaymentData) -> bool:
+        limit = limits.get(customer.customer_id)
+        return limit is None or payment.amount <= limit
+
+    return [
+        ValidationRule(
+            "customer_limit",
+            "Invalid payment data: customer limit exceeded",
+            within_limit,
+        )
+    ]
+
+
+RULE_BUILDERS: dict[str, Callable[[Any], list[ValidationRule]]] = {
+    "base_rules": _base_rules,
+    "amount_ranges": _amount_ranges,
+    "allowed_sources": _allowed_sources,
+    "email_pattern": _pattern("email", "Invalid customer data: malformed email"),
+    "phone_pattern": _pattern("phone", "Invalid customer data: malformed phone"),
+    "customer_limits": _customer_limits,
+}
+
+
+class RuleEngine:
+    """
+    Additional validation rules declared in config, checked in order until
+    the first rejection.
+
+    Every `sample_every`-th call evaluates all rules to measure how often
+    each one rejects, and every `reorder_every` calls the rule tuple is
+    swapped for one sorted by rejection rate, so invalid requests are
+    usually turned away by the first rule. When several rules fail, the
+    message reported is the one of the rule currently first. Counters are
+    updated without a lock; they only steer the ordering, so a lost update
+    just blurs the estimate.
+
+    `PaymentService` runs the engine after `CustomerValidator` and
+    `PaymentDataValidator`, so a service's config should only hold the rules
+    those do not cover; `base_rules` repeats their checks and is meant for
+    using the engine on its own.
+
+    Config keys are the ones in `RULE_BUILDERS`, for example::
+
+        {
+            "amount_ranges": {"USD": [1, 1000000], "*": [1, 500000]},
+            "allowed_sources": ["tok_", "pm_"],
+            "email_pattern": "[^@]+@[^@]+",
+            "customer_limits": {"cus_123": 5000}
+        }
+    """
+
+    def __init__(
+            self,
+            rules: list[ValidationRule],
+            sample_every: int = 64,
+            reorder_every: int = 10_000,
+    ):
+        self.rules = tuple(rules)
+        self.sample_every = sample_every
+        self.reorder_every = reorder_every
+        self._calls = itertools.count(1)
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], **kwargs) -> "RuleEngine":
+        rules: list[ValidationRule] = []
+        for key, value in config.items():
+            if key not in RULE_BUILDERS:
+                raise ValueError(f"Unknown validation rule: {key}")
+            rules.extend(RULE_BUILDERS[key](value))
+        return cls(rules, **kwargs)
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs) -> "RuleEngine":
+        with open(path) as config_file:
+            return cls.from_config(json.load(config_file), **kwargs)
+
+    def check(
+            self, customer_data: CustomerData, payment_data: PaymentData
+    ) -> Optional[str]:
+        """
+        Returns the message of the first rule rejecting the request, or None.
+        """
+        # next() on itertools.count is atomic, unlike `self._calls += 1`.
+        calls = next(self._calls)
+        if calls % self.sample_every == 0:
+            return self._check_sampled(calls, customer_data, payment_data)
+        for rule in self.rules:
+            if not rule.predicate(customer_data, payment_data):
+                return rule.message
+        return None
+
+    def validate(self, customer_data: CustomerData, payment_data: PaymentData):
+        message = self.check(customer_data, payment_data)
+        if message:
+            raise ValueError(message)
+
+    def _check_sampled(
+            self, calls: int, customer_data: CustomerData, payment_data: PaymentData
+    ) -> Optional[str]:
+        rules = self.rules
+        first_rejection = None
+        for rule in rules:
+            rule.evaluations += 1
+            if not rule.predicate(customer_data, payment_data):
+                rule.rejections += 1
+                first_rejection = first_rejection or rule.message
+        if calls % self.reorder_every < self.sample_every:
+            # Readers keep iterating the tuple they already hold.
+            self.rules = tuple(
+                sorted(rules, key=lambda rule: rule.rejection_rate, reverse=True)
+            )
+        return first_rejection
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from src.payment_service.async_service import AsyncPaymentService
+from src.payment_service.benchmarks.stubs import StubNotifier, StubPaymentProcessor
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class SlowLogger:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.logged = 0
+
+    def log_transaction(self, customer_data, payment_data, payment_response):
+        time.sleep(self.delay)
+        self.logged += 1
+
+    def log_refund(self, transaction_id, refund_response):
+        time.sleep(self.delay)
+        self.logged += 1
+
+
+def test_logging_does_not_block_the_event_loop():
+    logger = SlowLogger(delay=0.2)
+    processor = StubPaymentProcessor()
+    service = AsyncPaymentService(
+        payment_processor=processor,
+        notifier=StubNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=logger,
+        refund_processor=processor,
+    )
+    customer_data = CustomerData(
+        name="Jane", contact_info=ContactInfo(email="jane@example.com")
+    )
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def scenario():
+        task = asyncio.create_task(ticker())
+        response = await service.process_transaction(
+            customer_data, PaymentData(amount=500, source="tok_visa")
+        )
+        await service.process_refund(response.transaction_id)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    assert logger.logged == 2
+    assert ticks >= 20
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from src.payment_service.commons import PaymentResponse
+from src.payment_service.loggers.background import (
+    BackgroundTransactionLogger,
+    BackpressurePolicy,
+)
+
+
+class SlowLogger:
+    """
+    Takes a while per record so the queue stays full.
+    """
+
+    def __init__(self):
+        self.refunds = 0
+
+    def log_transaction(self, customer_data, payment_data, payment_response):
+        pass
+
+    def log_refund(self, transaction_id, refund_response):
+        time.sleep(0.0005)
+        self.refunds += 1
+
+
+def test_close_drains_and_returns_while_producers_drop_oldest():
+    delegate = SlowLogger()
+    logger = BackgroundTransactionLogger(
+        delegate, max_queue_size=2, backpressure=BackpressurePolicy.DROP_OLDEST
+    )
+    response = PaymentResponse(status="success", amount=500, transaction_id="tx_1")
+    rejected = []
+
+    def produce():
+        for _ in range(2_000):
+            try:
+                logger.log_refund("tx_1", response)
+            except ValueError:
+                rejected.append(1)
+                return
+
+    producers = [threading.Thread(target=produce) for _ in range(4)]
+    for producer in producers:
+        producer.start()
+    time.sleep(0.05)
+    closer = threading.Thread(target=logger.close)
+    closer.start()
+    closer.join(timeout=5)
+    for producer in producers:
+        producer.join(timeout=5)
+
+    assert not closer.is_alive()
+    stats = logger.stats()
+    assert stats.queue_depth == 0
+    assert stats.enqueued == stats.written + stats.dropped
+    assert stats.written == delegate.refunds
+    with pytest.raises(ValueError):
+        logger.log_refund("tx_1", response)
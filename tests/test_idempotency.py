@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.payment_service.benchmarks.stubs import StubNotifier, StubPaymentProcessor
+from src.payment_service.commons import (
+    ContactInfo,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+)
+from src.payment_service.idempotency import IdempotencyStore
+from src.payment_service.loggers import TransactionLogger
+from src.payment_service.processors.resilient import (
+    ResilientPaymentProcessor,
+    RetryPolicy,
+)
+from src.payment_service.service import PaymentService
+from src.payment_service.validators import CustomerValidator, PaymentDataValidator
+
+
+class CountingProcessor(StubPaymentProcessor):
+    def __init__(self, latency: float = 0.0, error: Exception = None):
+        super().__init__(latency)
+        self.error = error
+        self.calls = 0
+        self.refund_keys = []
+        self._lock = threading.Lock()
+
+    def process_transaction(self, customer_data, payment_data):
+        with self._lock:
+            self.calls += 1
+        if self.error:
+            raise self.error
+        return super().process_transaction(customer_data, payment_data)
+
+    def refund_payment(self, transaction_id, idempotency_key=None):
+        self.refund_keys.append(idempotency_key)
+        return super().refund_payment(transaction_id, idempotency_key)
+
+
+@pytest.fixture
+def customer_data():
+    return CustomerData(
+        name="John Doe", contact_info=ContactInfo(email="john@example.com")
+    )
+
+
+def make_service(tmp_path, processor, store) -> PaymentService:
+    return PaymentService(
+        payment_processor=processor,
+        notifier=StubNotifier(),
+        customer_validator=CustomerValidator(),
+        payment_validator=PaymentDataValidator(),
+        logger=TransactionLogger(str(tmp_path / "transactions.log")),
+        refund_processor=processor,
+        idempotency_store=store,
+    )
+
+
+def test_concurrent_duplicates_are_processed_once(tmp_path, customer_data):
+    processor = CountingProcessor(latency=0.05)
+    service = make_service(tmp_path, processor, IdempotencyStore())
+    payment_data = PaymentData(amount=500, source="tok_visa", idempotency_key="k1")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(
+            executor.map(
+                lambda _: service.process_transaction(customer_data, payment_data),
+                range(8),
+            )
+        )
+
+    assert processor.calls == 1
+    assert {response.transaction_id for response in responses} == {"stub_1"}
+
+
+def test_key_is_released_when_the_processor_raises(tmp_path, customer_data):
+    processor = CountingProcessor(error=ConnectionError("network down"))
+    service = make_service(tmp_path, processor, IdempotencyStore(wait_timeout=0.1))
+    payment_data = PaymentData(amount=500, source="tok_visa", idempotency_key="k1")
+
+    with pytest.raises(ConnectionError):
+        service.process_transaction(customer_data, payment_data)
+    processor.error = None
+    response = service.process_transaction(customer_data, payment_data)
+
+    assert processor.calls == 2
+    assert response.status == "success"
+
+
+def test_stored_response_expires_after_the_window(tmp_path, customer_data):
+    processor = CountingProcessor()
+    service = make_service(tmp_path, processor, IdempotencyStore(window=0.05))
+    payment_data = PaymentData(amount=500, source="tok_visa", idempotency_key="k1")
+
+    first = service.process_transaction(customer_data, payment_data)
+    assert service.process_transaction(customer_data, payment_data) == first
+    time.sleep(0.1)
+    second = service.process_transaction(customer_data, payment_data)
+
+    assert processor.calls == 2
+    assert second.transaction_id != first.transaction_id
+
+
+def test_equal_charges_without_a_key_both_go_through(tmp_path, customer_data):
+    processor = CountingProcessor()
+    service = make_service(tmp_path, processor, IdempotencyStore())
+    payment_data = PaymentData(amount=500, source="tok_visa")
+
+    first = service.process_transaction(customer_data, payment_data)
+    second = service.process_transaction(customer_data, payment_data)
+
+    assert processor.calls == 2
+    assert first.transaction_id != second.transaction_id
+
+
+def test_refunds_are_only_deduplicated_with_a_caller_key(tmp_path, customer_data):
+    processor = CountingProcessor()
+    service = make_service(tmp_path, processor, IdempotencyStore())
+
+    service.process_refund("ch_1")
+    service.process_refund("ch_1")
+    first = service.process_refund("ch_2", idempotency_key="r1")
+    second = service.process_refund("ch_2", idempotency_key="r1")
+
+    assert processor.refund_keys == [None, None, "r1"]
+    assert first == second
+
+
+def test_retries_of_one_charge_share_a_fresh_key(customer_data):
+    keys = []
+
+    class FlakyProcessor(StubPaymentProcessor):
+        def process_transaction(self, customer_data, payment_data):
+            keys.append(payment_data.idempotency_key)
+            if len(keys) % 2:
+                return PaymentResponse(
+                    status="failed", amount=0, message="timeout", retryable=True
+                )
+            return super().process_transaction(customer_data, payment_data)
+
+    processor = ResilientPaymentProcessor(
+        FlakyProcessor(), RetryPolicy(base_delay=0, max_delay=0)
+    )
+    payment_data = PaymentData(amount=500, source="tok_visa")
+    processor.process_transaction(customer_data, payment_data)
+    processor.process_transaction(customer_data, payment_data)
+
+    assert keys[0] == keys[1] != keys[2] == keys[3]
+
+
+def test_service_returns_validated_models_for_stored_responses(
+        tmp_path, customer_data
+):
+    service = make_service(tmp_path, CountingProcessor(), IdempotencyStore())
+    payment_data = PaymentData(amount=500, source="tok_visa", idempotency_key="k1")
+
+    first = service.process_transaction(customer_data, payment_data)
+    repeated = service.process_transaction(customer_data, payment_data)
+    refund = service.process_refund(first.transaction_id, "r1")
+
+    assert isinstance(first, PaymentResponse)
+    assert isinstance(repeated, PaymentResponse)
+    assert isinstance(refund, PaymentResponse)
+    assert repeated == first
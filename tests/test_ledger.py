@@ -0,0 +1,44 @@
+from src.payment_service.commons import (
+    ContactInfo,
+    CustomerData,
+    PaymentData,
+    PaymentResponse,
+)
+from src.payment_service.loggers import TransactionLedger
+
+
+def log_charge(ledger: TransactionLedger, status: str = "succeeded"):
+    ledger.log_transaction(
+        CustomerData(name="Jane", contact_info=ContactInfo(email="j@example.com")),
+        PaymentData(amount=500, source="tok_visa"),
+        PaymentResponse(status=status, amount=500, transaction_id="ch_1"),
+    )
+
+
+def test_relogging_a_charge_keeps_its_refund(tmp_path):
+    ledger = TransactionLedger(str(tmp_path / "ledger.db"))
+    log_charge(ledger)
+    ledger.reserve_refund("ch_1")
+    ledger.log_refund(
+        "ch_1", PaymentResponse(status="succeeded", amount=500, transaction_id="re_1")
+    )
+
+    log_charge(ledger)
+
+    entry = ledger.get("ch_1")
+    assert (entry.refund_id, entry.refund_status) == ("re_1", "succeeded")
+    ledger.close()
+
+
+def test_charge_logged_after_its_refund_was_reserved_keeps_the_reservation(
+        tmp_path
+):
+    ledger = TransactionLedger(str(tmp_path / "ledger.db"))
+    ledger.reserve_refund("ch_1")
+
+    log_charge(ledger)
+
+    entry = ledger.get("ch_1")
+    assert (entry.customer_name, entry.amount) == ("Jane", 500)
+    assert entry.refund_status == "pending"
+    ledger.close()
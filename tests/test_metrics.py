@@ -0,0 +1,45 @@
+import gc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from src.payment_service.benchmarks.stubs import StubPaymentProcessor
+from src.payment_service.commons import PaymentData, PaymentResponse
+from src.payment_service.instrumentation import MetricsRegistry, PaymentMetrics
+
+
+def test_cells_of_finished_threads_are_folded_into_the_total():
+    counter = MetricsRegistry().counter("events_total", "Events.").labels()
+    for _ in range(20):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: counter.inc(), range(10)))
+    gc.collect()
+
+    assert counter.value == 200
+    assert len(counter._shards._cells) == 0
+
+
+def test_transaction_children_are_shared_by_processors_of_one_kind():
+    metrics = PaymentMetrics(MetricsRegistry())
+    payment_data = PaymentData(amount=500, source="tok_visa")
+    response = PaymentResponse(status="success", amount=500)
+
+    for _ in range(3):
+        metrics.transaction_completed(
+            StubPaymentProcessor(), payment_data, response, 0.01
+        )
+
+    assert list(metrics._transaction_children) == [("StubPaymentProcessor", "USD")]
+    assert "StubPaymentProcessor" in metrics.registry.render()
+
+
+def test_dropped_log_records_are_exposed_as_a_counter():
+    registry = MetricsRegistry()
+    logger = SimpleNamespace(
+        stats=lambda: SimpleNamespace(queue_depth=0, lag_seconds=0.0, dropped=7)
+    )
+    PaymentMetrics(registry).watch_logger(logger)
+
+    rendered = registry.render()
+
+    assert "# TYPE payment_log_dropped_records_total counter" in rendered
+    assert 'payment_log_dropped_records_total{name="transactions"} 7' in rendered
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+
+from src.payment_service.benchmarks.stubs import StubNotifier
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.notifiers.outbox import NotificationOutbox
+
+
+class DeletingNotifier:
+    """
+    Fails every confirmation after the job vanished from the outbox, as when
+    another worker delivered it once the lease ran out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.calls = 0
+
+    def send_confirmation(self, customer_data, payment_data, payment_response):
+        self.calls += 1
+        with connect(self.path) as connection:
+            connection.execute("DELETE FROM notification_jobs")
+        raise ConnectionError("SMTP server unavailable")
+
+
+def connect(path: str) -> sqlite3.Connection:
+    return sqlite3.connect(path, isolation_level=None, timeout=1.0)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def make_outbox(path: str, **kwargs) -> NotificationOutbox:
+    options = dict(
+        sms_notifier=StubNotifier(),
+        email_notifier=StubNotifier(),
+        workers=1,
+        retry_delay=0.0,
+        max_attempts=1,
+        poll_interval=0.01,
+    )
+    options.update(kwargs)
+    return NotificationOutbox(path=path, **options)
+
+
+def send(outbox: NotificationOutbox):
+    outbox.send_confirmation(
+        CustomerData(name="Jane", contact_info=ContactInfo(email="j@example.com")),
+        PaymentData(amount=500, source="tok_visa"),
+    )
+
+
+def test_worker_survives_an_undecodable_job(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    outbox = make_outbox(path)
+    try:
+        with connect(path) as connection:
+            connection.execute(
+                "INSERT INTO notification_jobs (channel, payload, available_at, "
+                "created_at) VALUES ('email', 'not json', 0, 0)"
+            )
+        send(outbox)
+
+        assert wait_for(lambda: outbox.email_notifier.sent == 1)
+        assert wait_for(lambda: outbox.stats().dead == 1)
+        send(outbox)
+        assert wait_for(lambda: outbox.email_notifier.sent == 2)
+    finally:
+        outbox.close()
+
+
+def test_failed_claim_is_rolled_back(tmp_path, capsys):
+    path = str(tmp_path / "outbox.db")
+    outbox = make_outbox(path)
+    output = []
+
+    def claim_failure_reported():
+        output.append(capsys.readouterr().out)
+        return "disk I/O error" in "".join(output)
+
+    try:
+        with connect(path) as connection:
+            connection.execute(
+                "CREATE TRIGGER fail_lease BEFORE UPDATE OF leased_until "
+                "ON notification_jobs BEGIN SELECT RAISE(ABORT, 'disk I/O error'); "
+                "END"
+            )
+            send(outbox)
+            assert wait_for(claim_failure_reported)
+            # Fails with "database is locked" if the claim was left open.
+            connection.execute("DROP TRIGGER fail_lease")
+
+        assert wait_for(lambda: outbox.email_notifier.sent == 1)
+        assert outbox.stats().backlog == 0
+    finally:
+        outbox.close()
+
+
+def test_failure_of_a_job_deleted_meanwhile_is_ignored(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    outbox = make_outbox(path, email_notifier=DeletingNotifier(path))
+    try:
+        send(outbox)
+
+        assert wait_for(lambda: outbox.stats().failed_attempts == 1)
+        stats = outbox.stats()
+        assert (stats.backlog, stats.dead) == (0, 0)
+        send(outbox)
+        assert wait_for(lambda: outbox.email_notifier.calls == 2)
+    finally:
+        outbox.close()
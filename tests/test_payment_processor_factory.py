@@ -0,0 +1,56 @@
+import gc
+import threading
+
+import pytest
+
+from src.payment_service.benchmarks.stubs import StubPaymentProcessor
+from src.payment_service.commons.payment_data import PaymentType
+from src.payment_service.factories.payment_processor_factory import (
+    PaymentProcessorFactory,
+)
+
+
+class OtherProcessor(StubPaymentProcessor):
+    pass
+
+
+@pytest.fixture
+def registry():
+    saved = dict(PaymentProcessorFactory._registry)
+    yield PaymentProcessorFactory
+    PaymentProcessorFactory._registry.clear()
+    PaymentProcessorFactory._registry.update(saved)
+    PaymentProcessorFactory._routes.clear()
+
+
+def test_replacing_a_route_drops_its_per_thread_instances(registry):
+    for processor_type in (StubPaymentProcessor, OtherProcessor) * 20:
+        registry.register(
+            PaymentType.ONLINE, processor_type, currency="XTS", per_thread=True
+        )
+        gc.collect()
+        assert type(registry.resolve(PaymentType.ONLINE, "XTS")) is processor_type
+
+
+def test_per_thread_instances_are_not_shared(registry):
+    registry.register(
+        PaymentType.ONLINE, StubPaymentProcessor, currency="XTS", per_thread=True
+    )
+    instances = []
+    threads = [
+        threading.Thread(
+            target=lambda: instances.append(
+                registry.resolve(PaymentType.ONLINE, "XTS")
+            )
+        )
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(instance) for instance in instances}) == 3
+    assert registry.resolve(PaymentType.ONLINE, "XTS") is registry.resolve(
+        PaymentType.ONLINE, "XTS"
+    )
@@ -0,0 +1,69 @@
+import pytest
+
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.validators import RuleEngine, ValidationRule
+
+ENGINE = RuleEngine.from_config(
+    {
+        "amount_ranges": {"USD": [1, 1_000], "*": [1, 500]},
+        "allowed_sources": ["tok_", "pm_"],
+        "email_pattern": r"[^@\s]+@[^@\s]+\.[a-z]+",
+        "customer_limits": {"cus_1": 100},
+    }
+)
+
+
+def customer(email: str = "jane@example.com", customer_id=None) -> CustomerData:
+    return CustomerData(
+        name="Jane", contact_info=ContactInfo(email=email), customer_id=customer_id
+    )
+
+
+@pytest.mark.parametrize(
+    "customer_data, payment_data, message",
+    [
+        (customer(), PaymentData(amount=900, source="tok_visa"), None),
+        (
+            customer(),
+            PaymentData(amount=900, source="tok_visa", currency="EUR"),
+            "Invalid payment data: amount out of range",
+        ),
+        (
+            customer(),
+            PaymentData(amount=10, source="src_visa"),
+            "Invalid payment data: source not allowed",
+        ),
+        (
+            customer("jane"),
+            PaymentData(amount=10, source="tok_visa"),
+            "Invalid customer data: malformed email",
+        ),
+        (
+            customer(customer_id="cus_1"),
+            PaymentData(amount=200, source="tok_visa"),
+            "Invalid payment data: customer limit exceeded",
+        ),
+    ],
+)
+def test_first_rejecting_rule_is_reported(customer_data, payment_data, message):
+    assert ENGINE.check(customer_data, payment_data) == message
+
+
+def test_unknown_rules_are_rejected():
+    with pytest.raises(ValueError):
+        RuleEngine.from_config({"nope": True})
+
+
+def test_often_rejecting_rules_move_to_the_front():
+    passing = ValidationRule("passing", "never", lambda customer, payment: True)
+    rejecting = ValidationRule(
+        "small_amount", "too small", lambda customer, payment: payment.amount >= 100
+    )
+    engine = RuleEngine([passing, rejecting], sample_every=1, reorder_every=10)
+
+    for amount in range(20):
+        engine.check(customer(), PaymentData(amount=50 + amount, source="tok_visa"))
+
+    assert [rule.name for rule in engine.rules] == ["small_amount", "passing"]
+    assert rejecting.rejection_rate == 1.0
+    assert engine.check(customer(), PaymentData(amount=10, source="tok")) == "too small"
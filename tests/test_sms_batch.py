@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.notifiers.notifier import Confirmation
+from src.payment_service.notifiers.sms_batch import BatchingSMSNotifier
+
+
+class ShortAnswerGateway:
+    """
+    Acknowledges only the first message of every bulk request.
+    """
+
+    def send_bulk(self, gateway, messages):
+        return [None]
+
+
+def confirmation(number: int) -> Confirmation:
+    return Confirmation(
+        CustomerData(name="Jane", contact_info=ContactInfo(phone=f"+1555000{number}")),
+        PaymentData(amount=500, source="tok_visa"),
+    )
+
+
+def test_messages_without_a_gateway_result_fail_instead_of_hanging():
+    notifier = BatchingSMSNotifier(ShortAnswerGateway(), max_batch=3, max_wait=0.01)
+    futures = [notifier.submit(confirmation(number)) for number in range(3)]
+
+    assert futures[0].result(timeout=5) is None
+    for future in futures[1:]:
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+    notifier.close()
+
+
+class RecordingGateway:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.sent = []
+
+    def send_bulk(self, gateway, messages):
+        time.sleep(self.latency)
+        self.sent.extend(messages)
+        return [None] * len(messages)
+
+
+def test_close_waits_for_pending_messages_to_be_submitted():
+    gateway = RecordingGateway(latency=0.05)
+    notifier = BatchingSMSNotifier(gateway, max_batch=100, max_wait=10.0)
+    futures = [notifier.submit(confirmation(number)) for number in range(3)]
+
+    notifier.close()
+
+    assert len(gateway.sent) == 3
+    assert all(future.done() for future in futures)
+    with pytest.raises(ValueError):
+        notifier.submit(confirmation(4))
@@ -0,0 +1,91 @@
+import smtplib
+
+from src.payment_service.notifiers.smtp import Envelope, SMTPEmailBackend
+
+
+class FakeSession:
+    def __init__(self, disconnect: bool = False):
+        self.disconnect = disconnect
+        self.sent = 0
+        self.closed = False
+
+    def sendmail(self, sender, recipients, data):
+        if self.disconnect:
+            raise smtplib.SMTPServerDisconnected("connection closed")
+        self.sent += 1
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class ScriptedBackend(SMTPEmailBackend):
+    """
+    Opens the scripted sessions in order; an exception in the script is
+    raised by that connect attempt.
+    """
+
+    def __init__(self, sessions, **kwargs):
+        super().__init__(**kwargs)
+        self.sessions = list(sessions)
+        self.connects = 0
+
+    def _connect(self):
+        self.connects += 1
+        session = self.sessions.pop(0)
+        if isinstance(session, Exception):
+            raise session
+        return session
+
+
+ENVELOPES = [
+    Envelope("shop@example.com", [f"c{n}@example.com"], b"hi") for n in range(3)
+]
+
+
+def test_connect_failure_on_rotation_keeps_earlier_results():
+    refused = ConnectionRefusedError("refused")
+    backend = ScriptedBackend([FakeSession(), refused], max_messages_per_session=1)
+
+    results = backend.send_many(ENVELOPES)
+
+    assert results == [None, refused, refused]
+    assert backend.connects == 2
+
+
+def test_connect_failure_on_acquire_is_reported_per_envelope():
+    refused = ConnectionRefusedError("refused")
+    backend = ScriptedBackend([refused])
+
+    assert backend.send_many(ENVELOPES) == [refused] * 3
+
+
+def test_failed_reconnect_discards_the_dead_session():
+    dead = FakeSession(disconnect=True)
+    fresh = FakeSession()
+    backend = ScriptedBackend([dead, ConnectionRefusedError("refused"), fresh])
+
+    results = backend.send_many(ENVELOPES[:1])
+    assert isinstance(results[0], ConnectionRefusedError)
+    assert dead.closed
+
+    # The next batch opens a new session instead of reusing the dead one.
+    assert backend.send_many(ENVELOPES[:1]) == [None]
+    assert fresh.sent == 1
+
+
+def test_replacement_session_starts_counting_from_zero():
+    fresh = FakeSession()
+    backend = ScriptedBackend(
+        [FakeSession(disconnect=True), fresh, FakeSession()],
+        max_messages_per_session=3,
+    )
+
+    assert backend.send_many(ENVELOPES) == [None, None, None]
+    assert fresh.sent == 3
+    assert backend.connects == 2
+    # Three messages on the replacement session: the next one rotates it.
+    backend.send_many(ENVELOPES[:1])
+    assert backend.connects == 3 and fresh.closed
@@ -0,0 +1,40 @@
+import pytest
+
+from src.payment_service.commons import ContactInfo, CustomerData, PaymentData
+from src.payment_service.notifiers.templates import TemplateCatalog, format_amount
+
+
+@pytest.mark.parametrize(
+    "amount, currency, expected",
+    [
+        (500, "USD", "5.00"),
+        (500, "JPY", "500"),
+        (500, "krw", "500"),
+        (1_234, "KWD", "1.234"),
+        (5, "BHD", "0.005"),
+        (1_999, "EUR", "19.99"),
+    ],
+)
+def test_format_amount_uses_the_currency_minor_unit(amount, currency, expected):
+    assert format_amount(amount, currency) == expected
+
+
+def test_receipt_shows_the_amount_in_major_units():
+    customer_data = CustomerData(
+        name="Jane", contact_info=ContactInfo(phone="+15550000000")
+    )
+    payment_data = PaymentData(amount=500, source="tok_visa", currency="JPY")
+
+    sms = TemplateCatalog().render_sms("en", customer_data, payment_data)
+
+    assert "500 JPY" in sms
+
+
+@pytest.mark.parametrize(
+    "email", ["a@example.com\r\nBcc: victim@example.com", "a@example.com\nX: y"]
+)
+def test_line_breaks_in_the_recipient_are_rejected(email):
+    customer_data = CustomerData(name="Jane", contact_info=ContactInfo(email=email))
+
+    with pytest.raises(ValueError):
+        TemplateCatalog().render_email("en", "shop@example.com", customer_data)